@@ -0,0 +1,66 @@
+import logging
+import threading
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework import permissions
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_STATUSES = (200, 404)
+
+
+class AnonymousCacheMixin:
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if request.method not in permissions.SAFE_METHODS:
+            return response
+
+        patch_vary_headers(response, ('Authorization',))
+        if (request.user.is_authenticated
+                or response.status_code not in CACHEABLE_STATUSES):
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.API_CACHE_MAX_AGE,
+                stale_while_revalidate=(
+                    settings.API_CACHE_STALE_WHILE_REVALIDATE),
+            )
+        return response
+
+
+def refresh_cached_paths(paths):
+    base_url = settings.API_CACHE_REFRESH_URL.rstrip('/')
+    if not base_url:
+        return
+    headers = {'Host': settings.API_CACHE_REFRESH_HOST}
+    timeout = settings.API_CACHE_REFRESH_TIMEOUT
+
+    def refresh():
+        for path in paths:
+            request = urllib.request.Request(base_url + path,
+                                             headers=headers)
+            try:
+                urllib.request.urlopen(request, timeout=timeout).close()
+            except urllib.error.HTTPError:
+                pass
+            except OSError as error:
+                logger.warning('Не удалось обновить кэш %s: %s',
+                               request.full_url, error)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def refresh_recipe_cache(recipe_id, author_id):
+    list_path = settings.API_CACHE_RECIPE_LIST_PATH
+    refresh_cached_paths((
+        f'/api/recipes/{recipe_id}/',
+        list_path,
+        f'{list_path}&author={author_id}',
+    ))
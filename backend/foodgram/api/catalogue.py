@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from recipes.models import Ingredient, Tag
+
+CATALOGUE_CACHE_KEY = 'catalogue:{}'
+CATALOGUES = {
+    'tags': (Tag, 'TagSerializer'),
+    'ingredients': (Ingredient, 'IngredientSerializer'),
+}
+
+
+def get_catalogue(name):
+    key = CATALOGUE_CACHE_KEY.format(name)
+    items = cache.get(key)
+    if items is None:
+        from api import serializers
+
+        model, serializer_name = CATALOGUES[name]
+        serializer_class = getattr(serializers, serializer_name)
+        items = [dict(item) for item in
+                 serializer_class(model.objects.all(), many=True).data]
+        cache.set(key, items, settings.CATALOGUE_CACHE_TIMEOUT)
+    return items
+
+
+def clear_catalogue(name):
+    cache.delete(CATALOGUE_CACHE_KEY.format(name))
@@ -1,7 +1,14 @@
 import django_filters
+from django.db.models.functions import Lower
 from django_filters.rest_framework import filters
 
 from recipes.models import Recipe, Ingredient, Tag
+from users.models import User
+
+RANKING_CHOICES = (
+    ('popular', 'Популярные'),
+    ('trending', 'Набирающие популярность'),
+)
 
 
 class RecipeFilter(django_filters.FilterSet):
@@ -20,10 +27,15 @@ class RecipeFilter(django_filters.FilterSet):
         to_field_name='slug',
         queryset=Tag.objects.all()
     )
+    ordering = django_filters.ChoiceFilter(
+        choices=RANKING_CHOICES,
+        method='order_by_ranking',
+    )
 
     class Meta:
         model = Recipe
-        fields = ('is_favorited', 'is_in_shopping_cart', 'author', 'tags')
+        fields = ('is_favorited', 'is_in_shopping_cart', 'author', 'tags',
+                  'ordering')
 
     def filter_is_favorited(self, queryset, name, value):
         user = self.request.user
@@ -44,6 +56,11 @@ class RecipeFilter(django_filters.FilterSet):
     def filter_by_author(self, queryset, name, value):
         return queryset.filter(author__id=value)
 
+    def order_by_ranking(self, queryset, name, value):
+        return (queryset
+                .filter(score__isnull=False)
+                .order_by(f'-score__{value}', '-score__recipe_id'))
+
 
 class IngredientFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(
@@ -55,3 +72,16 @@ class IngredientFilter(django_filters.FilterSet):
         model = Ingredient
         fields = ('name',)
         strict = False
+
+
+class UserFilter(django_filters.FilterSet):
+    username = django_filters.CharFilter(method='filter_username_prefix')
+
+    class Meta:
+        model = User
+        fields = ('username',)
+
+    def filter_username_prefix(self, queryset, name, value):
+        return (queryset
+                .alias(username_lower=Lower('username'))
+                .filter(username_lower__startswith=value.lower()))
@@ -0,0 +1,64 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from api import throttling
+
+
+class BenchmarkView(APIView):
+    throttle_scope = 'read'
+
+
+class Command(BaseCommand):
+    help = ('Измеряет накладные расходы CostClassThrottle на один запрос '
+            'для локального, разделяемого между процессами '
+            'и кэш-хранилища.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100000)
+        parser.add_argument('--clients', type=int, default=1000)
+        parser.add_argument('--budget-us', type=float,
+                            default=settings.THROTTLE_BENCHMARK_BUDGET_US)
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        factory = APIRequestFactory()
+        requests = []
+        for number in range(options['clients']):
+            request = factory.get('/', REMOTE_ADDR=f'10.0.{number // 256}.'
+                                                   f'{number % 256}')
+            request.user = AnonymousUser()
+            requests.append(request)
+        view = BenchmarkView()
+
+        over_budget = []
+        for store in (throttling.LocalBucketStore,
+                      throttling.SharedMemoryBucketStore,
+                      throttling.CacheBucketStore):
+            try:
+                throttling._store = store()
+            except ImproperlyConfigured as error:
+                self.stdout.write(f'{store.__name__}: пропущено ({error})')
+                continue
+            throttle = throttling.CostClassThrottle()
+            start = time.perf_counter()
+            for number in range(total):
+                throttle.allow_request(requests[number % len(requests)],
+                                       view)
+            per_request = (time.perf_counter() - start) / total * 1e6
+            self.stdout.write(f'{store.__name__}: {per_request:.1f} мкс '
+                              f'на запрос')
+            if per_request > options['budget_us']:
+                over_budget.append(store.__name__)
+        throttling._store = None
+
+        if over_budget:
+            raise CommandError(
+                f'Превышен бюджет {options["budget_us"]:.0f} мкс: '
+                f'{", ".join(over_budget)}'
+            )
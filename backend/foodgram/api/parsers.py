@@ -0,0 +1,134 @@
+import io
+import json
+import re
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.parsers import JSONParser
+
+STRUCTURAL_TOKEN = re.compile(rb'["{}\[\]:,]')
+STRING_TOKEN = re.compile(rb'["\\]')
+QUOTE, BACKSLASH, COLON, COMMA = b'"\\:,'
+OPENING, CLOSING = b'{[', b'}]'
+
+BODY_TOO_LARGE = 'Размер запроса превышает {limit} байт.'
+FIELD_TOO_LARGE = 'Поле {field} превышает {limit} байт.'
+
+
+class RequestBodyTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Размер запроса превышает допустимый.'
+    default_code = 'request_too_large'
+
+
+class FieldSizeScanner:
+    def __init__(self, field_limits):
+        self.field_limits = field_limits
+        self.offset = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.reading_key = False
+        self.key = b''
+        self.field = None
+        self.field_start = 0
+
+    def feed(self, chunk):
+        position = 0
+        while position < len(chunk):
+            if self.in_string:
+                position = self.skip_string(chunk, position)
+                continue
+            match = STRUCTURAL_TOKEN.search(chunk, position)
+            if match is None:
+                break
+            position = match.end()
+            self.handle_token(chunk[match.start()], self.offset + position)
+        self.offset += len(chunk)
+        self.check(self.offset)
+
+    def skip_string(self, chunk, position):
+        if self.escaped:
+            self.escaped = False
+            end = position + 1
+        else:
+            match = STRING_TOKEN.search(chunk, position)
+            if match is None:
+                end = len(chunk)
+            elif chunk[match.start()] == BACKSLASH:
+                self.escaped = True
+                end = match.end()
+            else:
+                end = match.start()
+                self.in_string = False
+        if self.reading_key:
+            self.key += chunk[position:end]
+        if self.in_string:
+            return end
+        self.reading_key = False
+        return end + 1
+
+    def decode_key(self):
+        try:
+            return json.loads(b'"' + self.key + b'"')
+        except ValueError:
+            return self.key.decode(errors='replace')
+
+    def handle_token(self, token, offset):
+        if token == QUOTE:
+            self.in_string = True
+            if self.depth == 1 and self.field is None:
+                self.reading_key = True
+                self.key = b''
+        elif token in OPENING:
+            self.depth += 1
+        elif token in CLOSING:
+            self.depth -= 1
+            if self.depth == 0:
+                self.end_field(offset - 1)
+        elif token == COLON and self.depth == 1:
+            self.field = self.decode_key()
+            self.field_start = offset
+        elif token == COMMA and self.depth == 1:
+            self.end_field(offset - 1)
+
+    def end_field(self, offset):
+        self.check(offset)
+        self.field = None
+
+    def check(self, offset):
+        limit = self.field_limits.get(self.field)
+        if limit is not None and offset - self.field_start > limit:
+            raise RequestBodyTooLarge(
+                FIELD_TOO_LARGE.format(field=self.field, limit=limit)
+            )
+
+
+def get_body_limits(view):
+    return settings.REQUEST_BODY_LIMITS.get(
+        f'{getattr(view, "basename", None)}.{getattr(view, "action", None)}'
+    )
+
+
+class StreamingLimitJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        limits = get_body_limits(parser_context.get('view'))
+        if limits is None:
+            return super().parse(stream, media_type, parser_context)
+
+        total = limits['total']
+        request = parser_context['request']
+        if int(request.META.get('CONTENT_LENGTH') or 0) > total:
+            raise RequestBodyTooLarge(BODY_TOO_LARGE.format(limit=total))
+
+        scanner = FieldSizeScanner(limits.get('fields', {}))
+        body = io.BytesIO()
+        while chunk := stream.read(settings.REQUEST_BODY_CHUNK_SIZE):
+            if body.tell() + len(chunk) > total:
+                raise RequestBodyTooLarge(BODY_TOO_LARGE.format(limit=total))
+            scanner.feed(chunk)
+            body.write(chunk)
+        body.seek(0)
+        return super().parse(body, media_type, parser_context)
@@ -3,21 +3,60 @@ import base64
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.validators import EmailValidator
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from djoser.serializers import UserCreateSerializer
 from rest_framework import serializers
 
 from api.validators import UnicodeUsernameValidator
+from recipes.images import image_url, variants_representation
 from recipes.models import (Tag, Ingredient, Recipe,
                             RecipeIngredient, FavoriteRecipe, ShoppingCart)
+from recipes.nutrition import ingredient_totals
 from users.models import User, Subscription
 
 EMAIL_ERROR = {'email': 'Пользователь с такой почтой уже существует.'}
 USERNAME_ERROR = {'username': 'Пользователь с таким именем уже существует.'}
 
+UNIQUE_USER_CONSTRAINTS = {
+    'uniq_user_email_ci': EMAIL_ERROR,
+    'users_user_email_243f6e77_uniq': EMAIL_ERROR,
+    'uniq_user_username_ci': USERNAME_ERROR,
+    'users_user_username_key': USERNAME_ERROR,
+}
+
 ING_ERROR = "Ингредиенты должны быть уникальными"
 
 
+def unique_user_errors(email, username, instance=None):
+    users = User.objects.filter(
+        Q(email__iexact=email) | Q(username__iexact=username)
+    )
+    if instance is not None:
+        users = users.exclude(pk=instance.pk)
+
+    errors = {}
+    for user_email, user_username in users.values_list('email', 'username'):
+        if user_email.lower() == email.lower():
+            errors.update(EMAIL_ERROR)
+        if user_username.lower() == username.lower():
+            errors.update(USERNAME_ERROR)
+    return errors
+
+
+def raise_unique_user_error(error, email, username, instance=None):
+    constraint = getattr(getattr(error.__cause__, 'diag', None),
+                         'constraint_name', None)
+    if constraint in UNIQUE_USER_CONSTRAINTS:
+        raise serializers.ValidationError(
+            UNIQUE_USER_CONSTRAINTS[constraint]
+        )
+    errors = unique_user_errors(email, username, instance)
+    if errors:
+        raise serializers.ValidationError(errors)
+    raise error
+
+
 class Base64ImageField(serializers.ImageField):
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
@@ -68,17 +107,32 @@ class UsersSerializer(UserCreateSerializer):
             'password',
         )
 
-    def validate(self, data):
-        email = data.get('email')
-        username = data.get('username')
+    def unique_fields(self, data):
+        instance = self.instance
+        return (
+            data.get('email', getattr(instance, 'email', '')),
+            data.get('username', getattr(instance, 'username', '')),
+            instance,
+        )
 
-        if email and User.objects.filter(email=email).exists():
-            raise serializers.ValidationError(EMAIL_ERROR)
+    def validate(self, data):
+        errors = unique_user_errors(*self.unique_fields(data))
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
 
-        if username and User.objects.filter(username=username).exists():
-            raise serializers.ValidationError(USERNAME_ERROR)
+    def create(self, validated_data):
+        try:
+            return self.perform_create(validated_data)
+        except IntegrityError as error:
+            raise_unique_user_error(error, *self.unique_fields(validated_data))
 
-        return data
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as error:
+            raise_unique_user_error(error, *self.unique_fields(validated_data))
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -96,11 +150,51 @@ class UsersSerializer(UserCreateSerializer):
         return data
 
 
+class UserListSerializer(serializers.ModelSerializer):
+    is_subscribed = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = User
+        fields = (
+            'email',
+            'id',
+            'username',
+            'first_name',
+            'last_name',
+            'is_subscribed',
+        )
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+        if not (request and request.user.is_authenticated):
+            data.pop('is_subscribed')
+        return data
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     current_password = serializers.CharField(required=True)
     new_password = serializers.CharField(required=True)
 
 
+class RecipeIdsSerializer(serializers.Serializer):
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_RECIPES_LIMIT
+    )
+
+
+class FeedQuerySerializer(serializers.Serializer):
+    cursor = serializers.IntegerField(min_value=1, required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.FEED_MAX_PAGE_SIZE,
+        default=settings.FEED_PAGE_SIZE
+    )
+
+
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
@@ -234,6 +328,13 @@ class RecipeSerializer(serializers.ModelSerializer):
         data['tags'] = tags_info
         data['author'] = author_info
         data['ingredients'] = ingredients_info
+        data['image'] = image_url(instance, request)
+        data['image_variants'] = variants_representation(instance, request)
+        if self.context.get('with_nutrition'):
+            data['nutrition'] = ingredient_totals(
+                instance.recipes_ingredient.values_list('ingredient_id',
+                                                        'amount')
+            )
 
         if request.user and request.user.is_authenticated:
             data['author']['is_subscribed'] = Subscription.objects.filter(
@@ -298,7 +399,8 @@ class SubscriptionSerializer(serializers.ModelSerializer):
             {
                 'id': recipe.id,
                 'name': recipe.name,
-                'image': recipe.image.url,
+                'image': image_url(recipe),
+                'image_variants': variants_representation(recipe),
                 'cooking_time': recipe.cooking_time,
             }
             for recipe in recipes
@@ -316,7 +418,8 @@ class BaseRecipeSerializer(serializers.ModelSerializer):
         data = {
             'id': recipe.id,
             'name': recipe.name,
-            'image': recipe.image.url,
+            'image': image_url(recipe),
+            'image_variants': variants_representation(recipe),
             'cooking_time': recipe.cooking_time,
         }
         return data
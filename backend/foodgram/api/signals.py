@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.catalogue import clear_catalogue
+from recipes.models import Ingredient, Tag
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def clear_tag_catalogue(sender, **kwargs):
+    clear_catalogue('tags')
+
+
+@receiver((post_save, post_delete), sender=Ingredient)
+def clear_ingredient_catalogue(sender, **kwargs):
+    clear_catalogue('ingredients')
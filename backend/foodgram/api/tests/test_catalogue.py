@@ -0,0 +1,32 @@
+import tempfile
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+
+from api.catalogue import CATALOGUE_CACHE_KEY, get_catalogue
+from recipes.models import Tag
+
+
+class SharedCatalogueTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache_settings = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': directory.name,
+        }})
+        cache_settings.enable()
+        self.addCleanup(cache_settings.disable)
+        self.other_process = FileBasedCache(directory.name, {})
+
+    def test_invalidation_is_seen_by_other_processes(self):
+        Tag.objects.create(name='Завтрак', slug='breakfast', color='#E26C2D')
+        self.assertEqual(len(get_catalogue('tags')), 1)
+        key = CATALOGUE_CACHE_KEY.format('tags')
+        self.assertEqual(len(self.other_process.get(key)), 1)
+
+        Tag.objects.create(name='Обед', slug='lunch', color='#49B64E')
+        self.assertIsNone(self.other_process.get(key))
+        self.assertIsNone(caches['default'].get(key))
+        self.assertEqual(len(get_catalogue('tags')), 2)
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from foodgram.import_time import best_profile, import_time_ms
+
+
+class ImportTimeTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.modules = best_profile(3)
+
+    def test_lazy_modules_are_not_imported(self):
+        self.assertEqual(
+            [name for name in settings.IMPORT_TIME_LAZY_MODULES
+             if name in self.modules],
+            []
+        )
+
+    def test_budget(self):
+        self.assertLessEqual(import_time_ms(self.modules),
+                             settings.IMPORT_TIME_BUDGET_MS)
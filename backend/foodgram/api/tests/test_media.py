@@ -0,0 +1,68 @@
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from recipes.models import Recipe
+from users.models import User
+
+VARIANTS = [
+    {'name': f'recipes/variants/{width}/variant.{extension}',
+     'width': width, 'height': width, 'format': image_format}
+    for width in (160, 480)
+    for image_format, extension in (('webp', 'webp'), ('jpeg', 'jpg'))
+]
+
+
+class RecipeImageTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=directory.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.user = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+        self.recipe = Recipe.objects.create(
+            author=self.user, name='Блины', text='Текст.',
+            image=default_storage.save('recipes/images/recipe.png',
+                                       ContentFile(b'image')),
+            cooking_time=10
+        )
+        self.client = APIClient()
+        self.url = f'/api/recipes/{self.recipe.id}/image/'
+
+    def test_requires_authentication(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_file_response_without_accel_redirect(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'image')
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/media/')
+    def test_accel_redirect(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'],
+                         f'/media/{self.recipe.image.name}')
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/media/')
+    def test_payload_links_public_variant(self):
+        detail = f'/api/recipes/{self.recipe.id}/'
+        image = self.client.get(detail).json()['image']
+        self.assertTrue(image.endswith(self.url))
+
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            image_variants=VARIANTS
+        )
+        image = self.client.get(detail).json()['image']
+        self.assertTrue(image.endswith('/media/recipes/variants/480/'
+                                       'variant.jpg'))
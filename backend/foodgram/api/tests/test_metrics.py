@@ -0,0 +1,65 @@
+import multiprocessing
+import re
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from foodgram.metrics import MetricsRegistry, archive_worker, registry
+
+SAMPLE = {'requests_total': 3, 'request_seconds_total': 0.5}
+
+
+def record_in_worker(metrics_dir):
+    with override_settings(METRICS_DIR=metrics_dir):
+        worker = MetricsRegistry()
+        worker.record('worker-view', SAMPLE)
+        worker.flush()
+
+
+def requests_total(text, view):
+    return int(re.search(
+        rf'foodgram_requests_total{{view="{view}"}} (\d+)', text
+    ).group(1))
+
+
+class MetricsAggregationTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings = override_settings(METRICS_DIR=directory.name)
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+        self.metrics_dir = directory.name
+
+    def run_worker(self):
+        process = multiprocessing.get_context('fork').Process(
+            target=record_in_worker, args=(self.metrics_dir,)
+        )
+        process.start()
+        process.join()
+        return process.pid
+
+    def test_counters_survive_worker_exit(self):
+        local = MetricsRegistry()
+        local.record('worker-view', {'requests_total': 1})
+        pid = self.run_worker()
+        self.assertEqual(requests_total(local.render(), 'worker-view'), 4)
+
+        archive_worker(pid)
+        self.assertEqual(requests_total(local.render(), 'worker-view'), 4)
+
+        self.run_worker()
+        self.assertEqual(requests_total(local.render(), 'worker-view'), 7)
+
+    @override_settings(METRICS_SAMPLE_RATE=1)
+    def test_serialization_is_timed(self):
+        before = registry.snapshot().get('recipe-list', {})
+        with self.assertLogs('foodgram.metrics') as logs:
+            response = self.client.get('/api/recipes/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('"serialize_ms"', logs.output[0])
+        after = registry.snapshot()['recipe-list']
+        self.assertEqual(after['requests_total'],
+                         before.get('requests_total', 0) + 1)
+        self.assertGreater(after['serialize_seconds_total'],
+                           before.get('serialize_seconds_total', 0))
@@ -0,0 +1,133 @@
+import base64
+import io
+import json
+import tempfile
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from api.parsers import (FieldSizeScanner, RequestBodyTooLarge,
+                         StreamingLimitJSONParser)
+from recipes.models import Ingredient, Recipe, Tag
+from users.models import User
+
+LIMITS = {'total': 200, 'fields': {'name': 10, 'ingredients': 60}}
+SMALL_LIMITS = {'recipe.create': LIMITS}
+
+
+def scan(body, size=1, limits=None):
+    scanner = FieldSizeScanner(limits or LIMITS['fields'])
+    for start in range(0, len(body), size):
+        scanner.feed(body[start:start + size])
+
+
+def parse(body, content_length=None):
+    meta = {}
+    if content_length is not None:
+        meta['CONTENT_LENGTH'] = str(content_length)
+    return StreamingLimitJSONParser().parse(io.BytesIO(body), parser_context={
+        'view': SimpleNamespace(basename='recipe', action='create'),
+        'request': SimpleNamespace(META=meta),
+    })
+
+
+class FieldSizeScannerTests(SimpleTestCase):
+    def test_field_overflow_across_chunks(self):
+        body = b'{"name": "' + b'x' * 20 + b'", "text": "ok"}'
+        for size in (1, 3, 7, len(body)):
+            with self.subTest(size=size):
+                with self.assertRaises(RequestBodyTooLarge):
+                    scan(body, size)
+
+    def test_escapes_split_across_chunks(self):
+        fake = b'{"text": "a\\", \\"name\\": \\"' + b'x' * 20 + b'\\\\"}'
+        real = b'{"text": "a\\"b\\\\", "name": "' + b'x' * 20 + b'"}'
+        for size in range(1, len(real) + 1):
+            with self.subTest(size=size):
+                scan(fake, size)
+                with self.assertRaises(RequestBodyTooLarge):
+                    scan(real, size)
+
+    def test_escaped_key_is_decoded(self):
+        body = b'{"na\\u006de": "' + b'x' * 20 + b'"}'
+        for size in (1, 4, len(body)):
+            with self.subTest(size=size):
+                with self.assertRaises(RequestBodyTooLarge):
+                    scan(body, size)
+
+    def test_nested_lists_do_not_end_field(self):
+        item = b'{"id": 1, "amount": [1, 2]}'
+        short = b'{"ingredients": [' + item + b'], "name": "ok"}'
+        long = b'{"ingredients": [' + b', '.join([item] * 3) + b']}'
+        scan(short)
+        with self.assertRaises(RequestBodyTooLarge):
+            scan(long)
+
+
+@override_settings(REQUEST_BODY_LIMITS=SMALL_LIMITS)
+class StreamingLimitJSONParserTests(SimpleTestCase):
+    def test_content_length_precheck(self):
+        with self.assertRaises(RequestBodyTooLarge):
+            parse(b'{}', content_length=LIMITS['total'] + 1)
+
+    def test_running_total_without_content_length(self):
+        body = json.dumps({'text': 'x' * LIMITS['total']}).encode()
+        for content_length in (None, 2):
+            with self.subTest(content_length=content_length):
+                with self.assertRaises(RequestBodyTooLarge):
+                    parse(body, content_length)
+
+    def test_parses_within_limits(self):
+        self.assertEqual(parse(b'{"text": "\\u0431\\u043b"}', 25),
+                         {'text': 'бл'})
+
+
+class RecipeCreateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+        cls.tag = Tag.objects.create(name='Завтрак', slug='breakfast',
+                                     color='#E26C2D')
+        cls.ingredient = Ingredient.objects.create(name='мука',
+                                                   measurement_unit='г')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=directory.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def payload(self, **fields):
+        buffer = io.BytesIO()
+        Image.new('RGB', (2, 2)).save(buffer, 'png')
+        image = base64.b64encode(buffer.getvalue()).decode()
+        return {
+            'name': 'Блины',
+            'text': 'Смешать и пожарить.',
+            'cooking_time': 20,
+            'tags': [self.tag.id],
+            'ingredients': [{'id': self.ingredient.id, 'amount': 300}],
+            'image': f'data:image/png;base64,{image}',
+            **fields,
+        }
+
+    def test_recipe_is_created(self):
+        response = self.client.post('/api/recipes/', self.payload(),
+                                    format='json')
+        self.assertEqual(response.status_code, 201)
+        recipe = Recipe.objects.get()
+        self.assertEqual(recipe.recipes_ingredient.get().amount, 300)
+
+    def test_oversized_field_is_rejected(self):
+        response = self.client.post(
+            '/api/recipes/', self.payload(name='x' * 2048), format='json'
+        )
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Recipe.objects.exists())
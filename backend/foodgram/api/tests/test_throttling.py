@@ -0,0 +1,114 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from api.throttling import CacheBucketStore, SharedMemoryBucketStore
+
+CAPACITY = 20
+RATE = 1e-6
+
+
+def consume_all(path, attempts):
+    store = SharedMemoryBucketStore(path=path, slots=64)
+    return sum(not store.consume('read:ip:10.0.0.1', CAPACITY, RATE)
+               for _ in range(attempts))
+
+
+class SharedMemoryBucketStoreTests(SimpleTestCase):
+    def setUp(self):
+        file = tempfile.NamedTemporaryFile(delete=False)
+        file.close()
+        self.path = file.name
+        self.addCleanup(os.unlink, self.path)
+
+    def test_bucket_is_shared_between_processes(self):
+        context = multiprocessing.get_context('fork')
+        with context.Pool(4) as pool:
+            allowed = pool.starmap(consume_all, [(self.path, CAPACITY)] * 4)
+        self.assertEqual(sum(allowed), CAPACITY)
+
+    def test_retry_after(self):
+        store = SharedMemoryBucketStore(path=self.path, slots=64)
+        for _ in range(CAPACITY):
+            self.assertEqual(store.consume('key', CAPACITY, 2), 0)
+        self.assertAlmostEqual(store.consume('key', CAPACITY, 2), 0.5,
+                               places=1)
+
+    def test_keys_are_independent_and_evicted(self):
+        store = SharedMemoryBucketStore(path=self.path, slots=4)
+        for number in range(100):
+            self.assertEqual(store.consume(f'key:{number}', 1, RATE), 0)
+        self.assertGreater(store.consume('key:99', 1, RATE), 0)
+
+
+class AtomicCache(LocMemCache):
+    pass
+
+
+@override_settings(
+    CACHES={'default': {
+        'BACKEND': 'api.tests.test_throttling.AtomicCache',
+        'LOCATION': 'throttle-tests',
+    }},
+    THROTTLE_ATOMIC_CACHE_BACKENDS=('api.tests.test_throttling.AtomicCache',),
+)
+class CacheBucketStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('api.throttling.time.time',
+                             side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = CacheBucketStore()
+        self.store.cache.clear()
+
+    def consume_all(self, attempts, capacity=3, rate=1):
+        return sum(self.store.consume('key', capacity, rate) == 0
+                   for _ in range(attempts))
+
+    def test_burst_and_fractional_retry(self):
+        self.assertEqual(self.consume_all(4), 3)
+        self.now += 0.5
+        self.assertAlmostEqual(self.store.consume('key', 3, 1), 0.5)
+        self.now += 0.5
+        self.assertEqual(self.store.consume('key', 3, 1), 0)
+
+    def test_refill_is_capped_and_applied_once(self):
+        self.consume_all(3)
+        self.now += 100
+        self.assertEqual(self.consume_all(10), 3)
+        self.now += 1
+        self.assertEqual(self.consume_all(10), 1)
+
+    def test_concurrent_refill(self):
+        self.consume_all(3, capacity=20)
+        self.now += 100
+        barrier = threading.Barrier(8)
+        allowed = []
+
+        def consume():
+            barrier.wait()
+            allowed.append(self.consume_all(5, capacity=20))
+
+        workers = [threading.Thread(target=consume) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertGreaterEqual(sum(allowed), 20)
+
+    def test_non_atomic_caches_are_rejected(self):
+        for backend in ('django.core.cache.backends.locmem.LocMemCache',
+                        'django.core.cache.backends.dummy.DummyCache',
+                        'django.core.cache.backends.db.DatabaseCache'):
+            with self.subTest(backend=backend), override_settings(CACHES={
+                'default': {'BACKEND': backend, 'LOCATION': 'cache'}
+            }):
+                with self.assertRaises(ImproperlyConfigured):
+                    CacheBucketStore()
@@ -0,0 +1,182 @@
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from recipes.models import FavoriteRecipe, Recipe, ShoppingCart
+from users.models import Subscription, User
+
+
+class ConcurrentToggleTests(TransactionTestCase):
+    threads = 8
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com',
+            password='secret-pass'
+        )
+        self.author = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+        self.recipe = Recipe.objects.create(
+            author=self.author, name='Блины', text='Пожарить.',
+            image='recipes/images/pancakes.png', cooking_time=30
+        )
+
+    def post_concurrently(self, url):
+        barrier = threading.Barrier(self.threads)
+        statuses = []
+        errors = []
+
+        def post():
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                statuses.append(client.post(url).status_code)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=post)
+                   for _ in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        return sorted(statuses)
+
+    def assert_single_insert(self, statuses, queryset):
+        self.assertEqual(statuses, [201] + [400] * (self.threads - 1))
+        self.assertEqual(queryset.count(), 1)
+
+    def test_favorite(self):
+        statuses = self.post_concurrently(
+            f'/api/recipes/{self.recipe.id}/favorite/'
+        )
+        self.assert_single_insert(statuses, FavoriteRecipe.objects.filter(
+            user=self.user, recipe=self.recipe
+        ))
+
+    def test_shopping_cart(self):
+        statuses = self.post_concurrently(
+            f'/api/recipes/{self.recipe.id}/shopping_cart/'
+        )
+        self.assert_single_insert(statuses, ShoppingCart.objects.filter(
+            user=self.user, recipe=self.recipe
+        ))
+
+    def test_subscribe(self):
+        statuses = self.post_concurrently(
+            f'/api/users/{self.author.id}/subscribe/'
+        )
+        self.assert_single_insert(statuses, Subscription.objects.filter(
+            user=self.user, author=self.author
+        ))
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 1)
+
+    def test_bulk_favorite(self):
+        recipes = [
+            Recipe.objects.create(
+                author=self.author, name=f'Рецепт {number}', text='Текст.',
+                image='recipes/images/recipe.png', cooking_time=10
+            )
+            for number in range(4)
+        ]
+        recipe_ids = [recipe.id for recipe in recipes]
+        barrier = threading.Barrier(self.threads)
+        results = []
+
+        def post():
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                results.append(client.post('/api/recipes/bulk_favorite/',
+                                           {'recipes': recipe_ids},
+                                           format='json').json())
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=post)
+                   for _ in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        created = Counter(item['id'] for result in results for item in result
+                          if item['status'] == 'created')
+        self.assertEqual(len(results), self.threads)
+        self.assertEqual(created, Counter(recipe_ids))
+        self.assertEqual(FavoriteRecipe.objects.filter(user=self.user).count(),
+                         len(recipe_ids))
+
+
+class BulkToggleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='reader', email='reader@example.com',
+            password='secret-pass'
+        )
+        cls.recipes = [
+            Recipe.objects.create(
+                author=cls.user, name=f'Рецепт {number}', text='Текст.',
+                image='recipes/images/recipe.png', cooking_time=10
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        first, second, _ = self.recipes
+        self.missing = self.recipes[-1].id + 100
+        self.recipe_ids = [first.id, second.id, self.missing, first.id]
+        ShoppingCart.objects.create(user=self.user, recipe=second)
+
+    def bulk(self, method, recipe_ids):
+        return getattr(self.client, method)(
+            '/api/recipes/bulk_shopping_cart/', {'recipes': recipe_ids},
+            format='json'
+        )
+
+    def test_add(self):
+        first, second, _ = self.recipes
+        response = self.bulk('post', self.recipe_ids)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {'id': first.id, 'status': 'created'},
+            {'id': second.id, 'status': 'exists'},
+            {'id': self.missing, 'status': 'not_found'},
+        ])
+        self.assertEqual(
+            set(ShoppingCart.objects.values_list('recipe_id', flat=True)),
+            {first.id, second.id}
+        )
+
+    def test_remove(self):
+        first, second, _ = self.recipes
+        response = self.bulk('delete', self.recipe_ids)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {'id': first.id, 'status': 'absent'},
+            {'id': second.id, 'status': 'deleted'},
+            {'id': self.missing, 'status': 'not_found'},
+        ])
+        self.assertFalse(ShoppingCart.objects.exists())
+
+    def test_limit(self):
+        recipe_ids = list(range(1, settings.BULK_RECIPES_LIMIT + 2))
+        self.assertEqual(self.bulk('post', recipe_ids).status_code, 400)
+        self.assertEqual(
+            self.bulk('post', recipe_ids[:-1]).status_code, 200
+        )
@@ -0,0 +1,70 @@
+from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from api.serializers import UsersSerializer
+from users.models import User
+
+SIGNUP_URL = '/api/users/'
+
+
+class UserSignupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def signup(self, **fields):
+        data = {
+            'email': 'new@example.com',
+            'username': 'new',
+            'first_name': 'Имя',
+            'last_name': 'Фамилия',
+            'password': 'secret-pass',
+        }
+        data.update(fields)
+        return self.client.post(SIGNUP_URL, data, format='json')
+
+    def test_signup(self):
+        response = self.signup()
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.filter(username='new').exists())
+
+    def test_duplicate_email(self):
+        for email in ('cook@example.com', 'COOK@example.com'):
+            with self.subTest(email=email):
+                response = self.signup(email=email)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('email', response.json())
+
+    def test_duplicate_username(self):
+        for username in ('cook', 'Cook'):
+            with self.subTest(username=username):
+                response = self.signup(username=username)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('username', response.json())
+
+    def test_duplicate_email_and_username(self):
+        response = self.signup(email='cook@example.com', username='cook')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'email', 'username'})
+
+    def test_single_uniqueness_lookup(self):
+        with self.assertNumQueries(1):
+            response = self.signup(email='cook@example.com')
+        self.assertEqual(response.status_code, 400)
+
+    def test_integrity_error_is_mapped(self):
+        with self.assertRaises(ValidationError) as raised:
+            UsersSerializer().create({
+                'email': 'Cook@example.com',
+                'username': 'other',
+                'first_name': 'Имя',
+                'last_name': 'Фамилия',
+                'password': 'secret-pass',
+            })
+        self.assertIn('email', raised.exception.detail)
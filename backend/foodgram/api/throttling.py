@@ -0,0 +1,188 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+THROTTLE_CACHE_KEY = 'throttle:{}:{}'
+THROTTLE_SLOT = struct.Struct('<Qdd')
+THROTTLE_PROBES = 8
+THROTTLE_REFILL_LOCK_TIMEOUT = 1
+
+
+class LocalBucketStore:
+    def __init__(self, max_keys=None):
+        self.max_keys = max_keys or settings.THROTTLE_LOCAL_MAX_KEYS
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, rate, cost=1):
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        if allowed:
+            return 0
+        return (cost - tokens) / rate
+
+
+class SharedMemoryBucketStore:
+    def __init__(self, path=None, slots=None):
+        self.path = path or settings.THROTTLE_SHARED_PATH
+        self.slots = slots or settings.THROTTLE_SHARED_SLOTS
+        self.lock = threading.Lock()
+        self.pid = None
+
+    def open(self):
+        size = self.slots * THROTTLE_SLOT.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self.fd = fd
+        self.memory = mmap.mmap(fd, size)
+        self.pid = os.getpid()
+
+    def find_slot(self, key_hash):
+        memory = self.memory
+        start = key_hash % self.slots
+        oldest = None
+        for probe in range(THROTTLE_PROBES):
+            offset = (start + probe) % self.slots * THROTTLE_SLOT.size
+            stored_hash, tokens, updated = THROTTLE_SLOT.unpack_from(
+                memory, offset
+            )
+            if stored_hash == key_hash:
+                return offset, tokens, updated
+            if stored_hash == 0:
+                return offset, None, None
+            if oldest is None or updated < oldest[1]:
+                oldest = offset, updated
+        return oldest[0], None, None
+
+    def consume(self, key, capacity, rate, cost=1):
+        key_hash = int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little'
+        ) | 1
+        now = time.time()
+        with self.lock:
+            if self.pid != os.getpid():
+                self.open()
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                offset, tokens, updated = self.find_slot(key_hash)
+                if tokens is None:
+                    tokens, updated = capacity, now
+                tokens = min(capacity,
+                             tokens + max(now - updated, 0) * rate)
+                allowed = tokens >= cost
+                if allowed:
+                    tokens -= cost
+                THROTTLE_SLOT.pack_into(self.memory, offset,
+                                        key_hash, tokens, now)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        if allowed:
+            return 0
+        return (cost - tokens) / rate
+
+
+class CacheBucketStore:
+    def __init__(self, alias=None):
+        self.cache = caches[alias or settings.THROTTLE_CACHE_ALIAS]
+        backend = type(self.cache)
+        if (f'{backend.__module__}.{backend.__qualname__}'
+                not in settings.THROTTLE_ATOMIC_CACHE_BACKENDS):
+            raise ImproperlyConfigured(
+                'CacheBucketStore требует общий кэш с атомарным incr '
+                '(Redis или Memcached), на одном хосте используйте '
+                'SharedMemoryBucketStore.'
+            )
+
+    def consume(self, key, capacity, rate, cost=1):
+        now = time.time()
+        epoch_key = THROTTLE_CACHE_KEY.format('epoch', key)
+        used_key = THROTTLE_CACHE_KEY.format('used', key)
+        refill_key = THROTTLE_CACHE_KEY.format('refill', key)
+        timeout = settings.THROTTLE_CACHE_TIMEOUT
+        self.cache.add(epoch_key, now, timeout)
+        self.cache.add(used_key, 0, timeout)
+        epoch = self.cache.get(epoch_key, now)
+        limit = capacity + (now - epoch) * rate
+
+        try:
+            used = self.cache.incr(used_key, cost)
+        except ValueError:
+            self.cache.set(used_key, cost, timeout)
+            used = cost
+        missed = int(limit - capacity) - (used - cost)
+        if missed > 0 and self.cache.add(refill_key, 1,
+                                         THROTTLE_REFILL_LOCK_TIMEOUT):
+            try:
+                used = self.cache.incr(used_key, missed)
+            finally:
+                self.cache.delete(refill_key)
+        if used <= limit:
+            return 0
+        self.cache.decr(used_key, cost)
+        return (used - limit) / rate
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = import_string(settings.THROTTLE_STORE)()
+    return _store
+
+
+class CostClassThrottle(BaseThrottle):
+    def get_scope(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            scope = getattr(view, 'throttle_scopes', {}).get(
+                getattr(view, 'action', None)
+            )
+        if scope is None:
+            scope = 'read' if request.method in SAFE_METHODS else 'write'
+        return scope
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        if scope not in settings.THROTTLE_BUCKETS:
+            return True
+        capacity, rate = settings.THROTTLE_BUCKETS[scope]
+        user = request.user
+        ident = (f'user:{user.pk}' if user and user.is_authenticated
+                 else f'ip:{self.get_ident(request)}')
+        self.retry_after = get_bucket_store().consume(
+            f'{scope}:{ident}', capacity, rate
+        )
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
@@ -0,0 +1,84 @@
+import hashlib
+import mimetypes
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import connections, router
+from django.http import FileResponse, HttpResponse
+from django.utils.http import quote_etag
+
+
+def insert_ignore_sql(model, connection, rows, returning=None):
+    opts = model._meta
+    quote_name = connection.ops.quote_name
+    fields = [field for field in opts.local_concrete_fields
+              if field is not opts.pk]
+    placeholder = '({})'.format(', '.join(['%s'] * len(fields)))
+    sql = 'INSERT INTO {} ({}) VALUES {} ON CONFLICT DO NOTHING'.format(
+        quote_name(opts.db_table),
+        ', '.join(quote_name(field.column) for field in fields),
+        ', '.join([placeholder] * rows),
+    )
+    if returning is not None:
+        sql += ' RETURNING {}'.format(
+            quote_name(opts.get_field(returning).column)
+        )
+    return sql, fields
+
+
+def insert_ignore(instance):
+    model = type(instance)
+    using = router.db_for_write(model, instance=instance)
+    connection = connections[using]
+    sql, fields = insert_ignore_sql(model, connection, 1)
+    params = [
+        field.get_db_prep_save(field.pre_save(instance, True), connection)
+        for field in fields
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount == 1
+
+
+def insert_ignore_returning(model, instances, returning):
+    if not instances:
+        return set()
+    using = router.db_for_write(model)
+    connection = connections[using]
+    sql, fields = insert_ignore_sql(model, connection, len(instances),
+                                    returning)
+    params = [
+        field.get_db_prep_save(field.pre_save(instance, True), connection)
+        for instance in instances
+        for field in fields
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {row[0] for row in cursor.fetchall()}
+
+
+def media_file_response(file, filename):
+    if not settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        return FileResponse(file.open('rb'), as_attachment=True,
+                            filename=filename)
+
+    content_type, _ = mimetypes.guess_type(file.name)
+    response = HttpResponse(
+        content_type=content_type or 'application/octet-stream'
+    )
+    response['X-Accel-Redirect'] = quote(
+        os.path.join(settings.MEDIA_ACCEL_REDIRECT_PREFIX, file.name)
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def make_etag(*parts, weak=False):
+    digest = hashlib.md5(
+        repr(parts).encode(), usedforsecurity=False
+    ).hexdigest()
+    etag = quote_etag(digest)
+    return f'W/{etag}' if weak else etag
@@ -1,42 +1,100 @@
+import os
+
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Sum, Value
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.generics import CreateAPIView, DestroyAPIView
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import (IsAuthenticated, IsAdminUser,
+                                        AllowAny)
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
-from api.serializers import (UsersSerializer, TagSerializer,
+from api.cache import AnonymousCacheMixin, refresh_recipe_cache
+from api.catalogue import get_catalogue
+from api.serializers import (UsersSerializer, UserListSerializer,
+                             TagSerializer,
                              IngredientSerializer, RecipeSerializer,
                              SubscriptionSerializer, FavoriteRecipeSerializer,
-                             ShoppingCartSerializer, ChangePasswordSerializer)
+                             ShoppingCartSerializer, ChangePasswordSerializer,
+                             RecipeIdsSerializer, FeedQuerySerializer)
 from api.permissions import UserPermissions, IsRecipeAuthorOrReadOnly
 from api.pagination import PageLimitPagination
-from api.filters import RecipeFilter, IngredientFilter
+from api.parsers import StreamingLimitJSONParser
+from api.utils import (insert_ignore, insert_ignore_returning, make_etag,
+                       media_file_response)
+from api.filters import RecipeFilter, IngredientFilter, UserFilter
 from users.models import User, Subscription
+from recipes.feed import follow_author, get_feed_recipe_ids
 from recipes.models import (Tag, Ingredient,
                             Recipe, FavoriteRecipe,
                             RecipeIngredient, ShoppingCart)
+from recipes.nutrition import ingredient_table, ingredient_totals
+from recipes.units import format_amount, normalized_totals
+from recipes.transfer import RecipeImporter, export_recipes
 
 SHOPPING_LIST_FILE_TYPE = 'text/plain'
+SHOPPING_LIST_TOTALS = ('\n\nКалорийность: {calories} ккал'
+                        '\nБелки: {proteins} г, жиры: {fats} г, '
+                        'углеводы: {carbohydrates} г'
+                        '\nСтоимость: {cost} руб.')
+SHOPPING_LIST_INCOMPLETE = ('\nБез учёта ингредиентов, для которых нет '
+                            'данных о пищевой ценности или цене.')
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+USER_LIST_FIELDS = ('id', 'email', 'username', 'first_name', 'last_name')
+RECIPE_VALIDATOR_FIELDS = ('id', 'updated_at', 'viewer_favorited',
+                           'viewer_in_cart', 'viewer_subscribed')
 
 WRONG_PASSWORD_ERROR = {'current_password': 'Введён неверный пароль'}
 PASSWORD_CHANGE_COMPLETE = {'detail': 'Пароль успешно изменен.'}
 
+BULK_STATUS_CREATED = 'created'
+BULK_STATUS_EXISTS = 'exists'
+BULK_STATUS_DELETED = 'deleted'
+BULK_STATUS_ABSENT = 'absent'
+BULK_STATUS_NOT_FOUND = 'not_found'
+
 
 class UsersViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UsersSerializer
     pagination_class = PageLimitPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = UserFilter
 
     def get_permissions(self):
         if self.action in ('create', 'list'):
             return (AllowAny(),)
         return (UserPermissions(),)
 
+    def get_queryset(self):
+        if self.action not in ('list', 'retrieve'):
+            return super().get_queryset()
+
+        user = self.request.user
+        is_subscribed = Value(False)
+        if user.is_authenticated:
+            is_subscribed = Exists(Subscription.objects.filter(
+                user=user, author=OuterRef('pk')
+            ))
+        return (User.objects
+                .only(*USER_LIST_FIELDS)
+                .annotate(is_subscribed=is_subscribed)
+                .order_by('id'))
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'retrieve'):
+            return UserListSerializer
+        return super().get_serializer_class()
+
     @action(
         detail=False,
         methods=('GET',),
@@ -105,39 +163,185 @@ class UsersViewSet(viewsets.ModelViewSet):
         return Response(PASSWORD_CHANGE_COMPLETE, status=status.HTTP_200_OK)
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(AnonymousCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
 
+    def list(self, request, *args, **kwargs):
+        return Response(get_catalogue('tags'))
+
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(AnonymousCacheMixin,
+                        viewsets.ReadOnlyModelViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = IngredientFilter
 
+    def list(self, request, *args, **kwargs):
+        ingredients = get_catalogue('ingredients')
+        name = request.query_params.get('name')
+        if name:
+            prefix = name.lower()
+            ingredients = [ingredient for ingredient in ingredients
+                           if ingredient['name'].lower().startswith(prefix)]
+        return Response(ingredients)
+
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(AnonymousCacheMixin, viewsets.ModelViewSet):
     queryset = Recipe.objects.all()
     serializer_class = RecipeSerializer
     permission_classes = (IsRecipeAuthorOrReadOnly,)
     pagination_class = PageLimitPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
+    parser_classes = (StreamingLimitJSONParser, FormParser, MultiPartParser)
+    throttle_scopes = {
+        'create': 'upload',
+        'update': 'upload',
+        'partial_update': 'upload',
+        'download_shopping_cart': 'export',
+        'export': 'export',
+        'import_recipes': 'export',
+    }
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['with_nutrition'] = self.action == 'retrieve'
+        return context
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        recipe = serializer.save(author=self.request.user)
+        refresh_recipe_cache(recipe.id, recipe.author_id)
+
+    def perform_update(self, serializer):
+        recipe = serializer.save()
+        refresh_recipe_cache(recipe.id, recipe.author_id)
+
+    def perform_destroy(self, instance):
+        recipe_id, author_id = instance.id, instance.author_id
+        instance.delete()
+        refresh_recipe_cache(recipe_id, author_id)
+
+    def with_validators(self, queryset):
+        user = self.request.user
+        if not user.is_authenticated:
+            return queryset.annotate(
+                viewer_favorited=Value(False),
+                viewer_in_cart=Value(False),
+                viewer_subscribed=Value(False),
+            )
+        return queryset.annotate(
+            viewer_favorited=Exists(FavoriteRecipe.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            )),
+            viewer_in_cart=Exists(ShoppingCart.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            )),
+            viewer_subscribed=Exists(Subscription.objects.filter(
+                user=user, author=OuterRef('author')
+            )),
+        )
+
+    def conditional_response(self, etag, last_modified=None):
+        if not self.request.user.is_authenticated and last_modified:
+            last_modified = int(last_modified.timestamp())
+        else:
+            last_modified = None
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            response['ETag'] = etag
+        return response, last_modified
+
+    def with_etag(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
+        validators = self.paginate_queryset(
+            self.with_validators(queryset)
+            .values_list(*RECIPE_VALIDATOR_FIELDS)
+        )
+        if validators is None:
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+
+        etag = make_etag(request.get_full_path(),
+                         self.paginator.page.paginator.count,
+                         max((row[1] for row in validators), default=None),
+                         validators, weak=True)
+        not_modified, _ = self.conditional_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        recipes = queryset.in_bulk([row[0] for row in validators])
+        serializer = self.get_serializer(
+            [recipes[row[0]] for row in validators if row[0] in recipes],
+            many=True
+        )
+        return self.with_etag(
+            self.get_paginated_response(serializer.data), etag, None
+        )
 
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            validators = (self.with_validators(self.get_queryset())
+                          .filter(pk=kwargs['pk'])
+                          .values_list(*RECIPE_VALIDATOR_FIELDS)
+                          .first())
+        except (TypeError, ValueError):
+            validators = None
+        if validators is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = make_etag(validators, ingredient_table.get().version)
+        not_modified, last_modified = self.conditional_response(
+            etag, validators[1]
+        )
+        if not_modified is not None:
+            return not_modified
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.with_etag(
+            super().retrieve(request, *args, **kwargs), etag, last_modified
+        )
+
+    @action(
+        detail=False,
+        methods=('GET',),
+        url_path='feed',
+        permission_classes=(IsAuthenticated,))
+    def feed(self, request):
+        serializer = FeedQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        limit = serializer.validated_data['limit']
+
+        recipe_ids = get_feed_recipe_ids(
+            request.user,
+            limit,
+            before=serializer.validated_data.get('cursor')
+        )
+        recipes = {
+            recipe.id: recipe
+            for recipe in self.get_queryset().filter(id__in=recipe_ids)
+        }
+        page = [recipes[recipe_id] for recipe_id in recipe_ids
+                if recipe_id in recipes]
+
+        next_url = None
+        if len(recipe_ids) == limit:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor', recipe_ids[-1]
+            )
+
+        return Response({
+            'next': next_url,
+            'results': self.get_serializer(page, many=True).data,
+        })
 
     @action(detail=True,
             methods=('POST', 'DELETE'),
@@ -145,14 +349,10 @@ class RecipeViewSet(viewsets.ModelViewSet):
             permission_classes=(IsAuthenticated,))
     def favorite(self, request, pk=None):
         recipe = self.get_object()
-        user = request.user
-        favorite_recipe = (FavoriteRecipe.objects
-                           .filter(user=user, recipe=recipe).first())
+        favorite_recipe = FavoriteRecipe(user=request.user, recipe=recipe)
 
         if request.method == 'POST':
-            if not favorite_recipe:
-                favorite_recipe = (FavoriteRecipe.objects
-                                   .create(user=user, recipe=recipe))
+            if insert_ignore(favorite_recipe):
                 serializer = FavoriteRecipeSerializer(favorite_recipe)
                 return Response(
                     serializer.data,
@@ -163,8 +363,9 @@ class RecipeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         if request.method == 'DELETE':
-            if favorite_recipe:
-                favorite_recipe.delete()
+            deleted, _ = (FavoriteRecipe.objects
+                          .filter(user=request.user, recipe=recipe).delete())
+            if deleted:
                 return Response(status=status.HTTP_204_NO_CONTENT)
             return Response(
                 {'detail': 'Этого рецепта нет в избранном'},
@@ -178,14 +379,10 @@ class RecipeViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,))
     def shopping_cart(self, request, pk=None):
         recipe = self.get_object()
-        user = request.user
-        cart_recipe = (ShoppingCart.objects
-                       .filter(user=user, recipe=recipe).first())
+        cart_recipe = ShoppingCart(user=request.user, recipe=recipe)
 
         if request.method == 'POST':
-            if not cart_recipe:
-                cart_recipe = (ShoppingCart.objects
-                               .create(user=user, recipe=recipe))
+            if insert_ignore(cart_recipe):
                 serializer = ShoppingCartSerializer(cart_recipe)
                 return Response(
                     serializer.data,
@@ -196,14 +393,113 @@ class RecipeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         if request.method == 'DELETE':
-            if cart_recipe:
-                cart_recipe.delete()
+            deleted, _ = (ShoppingCart.objects
+                          .filter(user=request.user, recipe=recipe).delete())
+            if deleted:
                 return Response(status=status.HTTP_204_NO_CONTENT)
             return Response(
                 {'detail': 'Этого рецепта нет в списке покупок'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    def bulk_toggle(self, request, model):
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        recipe_ids = list(dict.fromkeys(serializer.validated_data['recipes']))
+
+        found = set(Recipe.objects
+                    .filter(id__in=recipe_ids)
+                    .values_list('id', flat=True))
+
+        if request.method == 'POST':
+            changed = insert_ignore_returning(model, [
+                model(user=request.user, recipe_id=recipe_id)
+                for recipe_id in recipe_ids if recipe_id in found
+            ], 'recipe')
+            done, skipped = BULK_STATUS_CREATED, BULK_STATUS_EXISTS
+        else:
+            with transaction.atomic():
+                user_recipes = (model.objects
+                                .select_for_update()
+                                .filter(user=request.user,
+                                        recipe_id__in=found))
+                changed = set(user_recipes.values_list('recipe_id',
+                                                       flat=True))
+                if changed:
+                    model.objects.filter(user=request.user,
+                                         recipe_id__in=changed).delete()
+            done, skipped = BULK_STATUS_DELETED, BULK_STATUS_ABSENT
+
+        result = []
+        for recipe_id in recipe_ids:
+            if recipe_id not in found:
+                item_status = BULK_STATUS_NOT_FOUND
+            elif recipe_id in changed:
+                item_status = done
+            else:
+                item_status = skipped
+            result.append({'id': recipe_id, 'status': item_status})
+
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=('POST', 'DELETE'),
+        url_path='bulk_favorite',
+        permission_classes=(IsAuthenticated,))
+    def bulk_favorite(self, request):
+        return self.bulk_toggle(request, FavoriteRecipe)
+
+    @action(
+        detail=False,
+        methods=('POST', 'DELETE'),
+        url_path='bulk_shopping_cart',
+        permission_classes=(IsAuthenticated,))
+    def bulk_shopping_cart(self, request):
+        return self.bulk_toggle(request, ShoppingCart)
+
+    @action(
+        detail=True,
+        methods=('GET',),
+        url_path='image',
+        permission_classes=(IsAuthenticated,))
+    def image(self, request, pk=None):
+        recipe = self.get_object()
+        extension = os.path.splitext(recipe.image.name)[1]
+        return media_file_response(recipe.image, f'{recipe.id}{extension}')
+
+    @action(
+        detail=False,
+        methods=('GET',),
+        url_path='export',
+        permission_classes=(IsAdminUser,))
+    def export(self, request):
+        recipes = self.filter_queryset(Recipe.objects.all())
+        response = StreamingHttpResponse(export_recipes(recipes),
+                                         content_type=NDJSON_CONTENT_TYPE)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{settings.RECIPE_EXPORT_FILENAME}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        methods=('POST',),
+        url_path='import',
+        permission_classes=(IsAdminUser,))
+    def import_recipes(self, request):
+        importer = RecipeImporter(default_author=request.user)
+        created, errors = importer.run(request.stream or ())
+        return Response({
+            'created': created,
+            'skipped': importer.skipped,
+            'errors_count': len(errors),
+            'errors': [
+                {'line': number, 'error': error}
+                for number, error in errors[:settings.RECIPE_IMPORT_MAX_ERRORS]
+            ],
+        }, status=status.HTTP_201_CREATED)
+
     @action(
         detail=False,
         methods=('GET',),
@@ -211,22 +507,27 @@ class RecipeViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,))
     def download_shopping_cart(self, *args, **kwargs):
         user = self.request.user
-        ingredients_total = (RecipeIngredient.objects
-                             .filter(recipe__users_cart__user=user)
-                             .values('ingredient__name',
-                                     'ingredient__measurement_unit')
-                             .annotate(total_amount=Sum('amount')))
+        cart_ingredients = RecipeIngredient.objects.filter(
+            recipe__users_cart__user=user
+        )
 
         shopping_list = []
-        for ingredient in ingredients_total:
-            ingredient_name = ingredient['ingredient__name']
-            ingredient_amount = ingredient['total_amount']
-            ingredient_unit = ingredient['ingredient__measurement_unit']
-            shopping_list.append(
-                f'{ingredient_name} - {ingredient_amount} {ingredient_unit}'
-            )
+        for ingredient in normalized_totals(cart_ingredients):
+            unit = ingredient['unit']
+            amount = format_amount(ingredient['total_amount'], unit)
+            shopping_list.append(f'{ingredient["name"]} - {amount} {unit}')
 
         shopping_list_text = 'Список покупок:\n\n' + '\n'.join(shopping_list)
+        if shopping_list:
+            totals = ingredient_totals(
+                cart_ingredients
+                .values('ingredient')
+                .annotate(total_amount=Sum('amount'))
+                .values_list('ingredient', 'total_amount')
+            )
+            shopping_list_text += SHOPPING_LIST_TOTALS.format(**totals)
+            if not totals['complete']:
+                shopping_list_text += SHOPPING_LIST_INCOMPLETE
 
         response = HttpResponse(shopping_list_text,
                                 content_type=SHOPPING_LIST_FILE_TYPE)
@@ -250,18 +551,14 @@ class SubscribeUserView(CreateAPIView, DestroyAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if Subscription.objects.filter(
-                user=request.user, author=author
-        ).exists():
+        subscription = Subscription(user=request.user, author=author)
+        if not insert_ignore(subscription):
             return Response(
                 {'detail': 'Вы уже подписаны на этого пользователя.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        follow_author(request.user.id, author.id)
 
-        subscription = Subscription.objects.create(
-            user=request.user,
-            author=author
-        )
         serializer = self.get_serializer(
             subscription,
             context={'request': request}
@@ -271,12 +568,11 @@ class SubscribeUserView(CreateAPIView, DestroyAPIView):
 
     def destroy(self, request, *args, **kwargs):
         author = get_object_or_404(User, id=kwargs.get('id'))
-        subscription = Subscription.objects.filter(
+        deleted, _ = Subscription.objects.filter(
             user=request.user, author=author
-        ).first()
+        ).delete()
 
-        if subscription:
-            subscription.delete()
+        if deleted:
             return Response(
                 {'detail': 'Вы успешно отписались от пользователя.'},
                 status=status.HTTP_204_NO_CONTENT
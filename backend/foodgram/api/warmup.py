@@ -0,0 +1,41 @@
+import logging
+import threading
+
+from django.apps import apps
+from django.db import connections
+from django.http import JsonResponse
+from django.urls import get_resolver
+
+from api.catalogue import CATALOGUES, get_catalogue
+from recipes.nutrition import ingredient_table
+
+logger = logging.getLogger(__name__)
+
+ready = threading.Event()
+lock = threading.Lock()
+
+
+def warm_up():
+    with lock:
+        if ready.is_set():
+            return True
+        try:
+            for connection in connections.all():
+                connection.ensure_connection()
+            get_resolver().reverse_dict
+            for model in apps.get_models():
+                model._meta.get_fields()
+            ingredient_table.get()
+            for name in CATALOGUES:
+                get_catalogue(name)
+        except Exception:
+            logger.exception('Прогрев приложения не удался')
+            return False
+        ready.set()
+        return True
+
+
+def readiness_view(request):
+    if ready.is_set() or warm_up():
+        return JsonResponse({'status': 'ready'})
+    return JsonResponse({'status': 'warming_up'}, status=503)
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+SETUP_CODE = 'import django; django.setup()'
+
+
+def profile_imports():
+    result = subprocess.run(
+        (sys.executable, '-X', 'importtime', '-c', SETUP_CODE),
+        capture_output=True, text=True, check=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us),
+                                 len(name) - len(name.lstrip()))
+    return modules
+
+
+def import_time_ms(modules):
+    return sum(self_us for self_us, _, _ in modules.values()) / 1000
+
+
+def best_profile(repeat):
+    runs = [profile_imports() for _ in range(repeat)]
+    return min(runs, key=import_time_ms)
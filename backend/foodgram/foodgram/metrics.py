@@ -0,0 +1,270 @@
+import contextvars
+import fcntl
+import glob
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+
+logger = logging.getLogger('foodgram.metrics')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+ARCHIVE_NAME = 'archive'
+LOCK_NAME = '.lock'
+
+METRICS = (
+    ('requests_total', 'counter', 'Sampled requests'),
+    ('request_seconds_total', 'counter', 'Time spent handling requests'),
+    ('serialize_seconds_total', 'counter',
+     'Time spent in serializer data'),
+    ('render_seconds_total', 'counter', 'Time spent rendering responses'),
+    ('db_queries_total', 'counter', 'SQL queries executed'),
+    ('db_seconds_total', 'counter', 'Time spent in SQL queries'),
+    ('db_duplicate_queries_total', 'counter', 'Repeated SQL queries'),
+    ('response_bytes_total', 'counter', 'Response body size'),
+)
+
+
+serialization = contextvars.ContextVar('metrics_serialization',
+                                       default=None)
+_serializers_instrumented = False
+
+
+def metrics_path(name):
+    return os.path.join(settings.METRICS_DIR, f'{name}.json')
+
+
+@contextmanager
+def metrics_lock(operation):
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    with open(os.path.join(settings.METRICS_DIR, LOCK_NAME), 'a') as file:
+        fcntl.flock(file, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def read_snapshot(path):
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_snapshot(path, snapshot):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(snapshot, file)
+    os.replace(temporary, path)
+
+
+def merge_snapshot(totals, snapshot):
+    for view, values in snapshot.items():
+        totals[view].update(values)
+    return totals
+
+
+def archive_worker(pid):
+    path = metrics_path(pid)
+    with metrics_lock(fcntl.LOCK_EX):
+        snapshot = read_snapshot(path)
+        if snapshot:
+            archive = merge_snapshot(
+                defaultdict(Counter), read_snapshot(metrics_path(ARCHIVE_NAME))
+            )
+            write_snapshot(metrics_path(ARCHIVE_NAME),
+                           merge_snapshot(archive, snapshot))
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def clear_metrics():
+    for path in glob.glob(metrics_path('*')):
+        os.remove(path)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(Counter)
+        self.flushed_at = 0.0
+
+    def record(self, view, sample):
+        with self.lock:
+            self.views[view].update(sample)
+            due = (time.monotonic() - self.flushed_at
+                   >= settings.METRICS_FLUSH_INTERVAL)
+        if due:
+            self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            return {view: dict(values) for view, values in self.views.items()}
+
+    def flush(self):
+        snapshot = self.snapshot()
+        with self.lock:
+            self.flushed_at = time.monotonic()
+        if snapshot:
+            write_snapshot(metrics_path(os.getpid()), snapshot)
+
+    def collect(self):
+        own = os.path.basename(metrics_path(os.getpid()))
+        totals = defaultdict(Counter)
+        with metrics_lock(fcntl.LOCK_SH):
+            for path in glob.glob(metrics_path('*')):
+                if os.path.basename(path) != own:
+                    merge_snapshot(totals, read_snapshot(path))
+        return merge_snapshot(totals, self.snapshot())
+
+    def render(self):
+        snapshot = self.collect()
+        lines = []
+        for name, metric_type, description in METRICS:
+            metric = f'foodgram_{name}'
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} {metric_type}')
+            for view, values in sorted(snapshot.items()):
+                lines.append(
+                    f'{metric}{{view="{view}"}} {values.get(name, 0)}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def timed_data(data):
+    def wrapper(self):
+        state = serialization.get()
+        if state is None or state['active']:
+            return data.fget(self)
+        state['active'] = True
+        start = time.perf_counter()
+        try:
+            return data.fget(self)
+        finally:
+            state['seconds'] += time.perf_counter() - start
+            state['active'] = False
+    return property(wrapper)
+
+
+def instrument_serializers():
+    global _serializers_instrumented
+    if _serializers_instrumented:
+        return
+    from rest_framework import serializers
+
+    for serializer_class in (serializers.Serializer,
+                             serializers.ListSerializer):
+        serializer_class.data = timed_data(serializer_class.data)
+    _serializers_instrumented = True
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values()
+                   if count > 1)
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+
+        instrument_serializers()
+        recorder = QueryRecorder()
+        request._metrics_render_seconds = 0.0
+        serialized = {'seconds': 0.0, 'active': False}
+        token = serialization.set(serialized)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                response = self.get_response(request)
+        finally:
+            serialization.reset(token)
+        elapsed = time.perf_counter() - start
+
+        self.record(request, response, recorder, elapsed,
+                    serialized['seconds'])
+        return response
+
+    def process_template_response(self, request, response):
+        if hasattr(request, '_metrics_render_seconds'):
+            start = time.perf_counter()
+
+            def finish_render(rendered):
+                request._metrics_render_seconds = time.perf_counter() - start
+
+            response.add_post_render_callback(finish_render)
+        return response
+
+    def record(self, request, response, recorder, elapsed, serialize_seconds):
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        size = (len(response.content)
+                if not response.streaming else 0)
+
+        registry.record(view, {
+            'requests_total': 1,
+            'request_seconds_total': elapsed,
+            'serialize_seconds_total': serialize_seconds,
+            'render_seconds_total': request._metrics_render_seconds,
+            'db_queries_total': recorder.count,
+            'db_seconds_total': recorder.seconds,
+            'db_duplicate_queries_total': recorder.duplicates,
+            'response_bytes_total': size,
+        })
+
+        level = logging.INFO
+        if recorder.duplicates >= settings.METRICS_DUPLICATE_QUERIES_THRESHOLD:
+            level = logging.WARNING
+        logger.log(level, json.dumps({
+            'view': view,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 2),
+            'serialize_ms': round(serialize_seconds * 1000, 2),
+            'render_ms': round(request._metrics_render_seconds * 1000, 2),
+            'queries': recorder.count,
+            'sql_ms': round(recorder.seconds * 1000, 2),
+            'duplicate_queries': recorder.duplicates,
+            'response_bytes': size,
+        }, ensure_ascii=False))
+
+
+def metrics_view(request):
+    return HttpResponse(registry.render(),
+                        content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if queryset.query.where or connection.vendor != 'postgresql':
+            return super().count
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                (queryset.model._meta.db_table,)
+            )
+            row = cursor.fetchone()
+
+        if row is None or row[0] < settings.ADMIN_EXACT_COUNT_LIMIT:
+            return super().count
+        return int(row[0])
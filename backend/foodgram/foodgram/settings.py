@@ -1,9 +1,13 @@
 import os
+import tempfile
 
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+SHARED_DIR = ('/dev/shm' if os.path.isdir('/dev/shm')
+              else tempfile.gettempdir())
+
 SECRET_KEY = os.getenv('SECRET_KEY')
 
 DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
@@ -27,6 +31,7 @@ INSTALLED_APPS = (
     'users.apps.UsersConfig',
     'recipes.apps.RecipesConfig',
     'api.apps.ApiConfig',
+    'tasks.apps.TasksConfig',
 )
 
 AUTH_USER_MODEL = 'users.User'
@@ -39,6 +44,7 @@ MIDDLEWARE = (
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'foodgram.metrics.RequestMetricsMiddleware',
 )
 
 ROOT_URLCONF = 'foodgram.urls'
@@ -61,6 +67,8 @@ TEMPLATES = (
 
 WSGI_APPLICATION = 'foodgram.wsgi.application'
 
+TEST_RUNNER = 'foodgram.test_runner.TestRunner'
+
 DATABASES = {
     'default': {
         'ENGINE': os.getenv('DB_ENGINE', default='django.db.backends.postgresql'),
@@ -72,6 +80,17 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION',
+                              os.path.join(SHARED_DIR, 'foodgram-cache')),
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = (
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -87,6 +106,19 @@ AUTH_PASSWORD_VALIDATORS = (
     },
 )
 
+PASSWORD_HASHERS = (
+    'users.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+)
+
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '19456'))
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '1'))
+
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv('PASSWORD_HASHING_WORKERS', os.cpu_count() or 1)
+)
 
 LANGUAGE_CODE = 'en-us'
 
@@ -98,14 +130,85 @@ USE_TZ = True
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'foodgram.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
 
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATIC_SYNC_DIR = os.getenv('STATIC_SYNC_DIR', '')
+STATIC_MANIFEST_NAME = '.staticfiles.sha256'
 
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'foodgram.metrics': {
+            'handlers': ('console',),
+            'level': os.getenv('METRICS_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        'foodgram.tasks': {
+            'handlers': ('console',),
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
+IMPORT_TIME_BUDGET_MS = 500
+IMPORT_TIME_LAZY_MODULES = (
+    'PIL',
+    'djoser.serializers',
+    'numpy',
+    'requests',
+    'rest_framework.serializers',
+)
+
+TASKS_WORKERS = int(os.getenv('TASKS_WORKERS', os.cpu_count() or 1))
+TASKS_POLL_INTERVAL = 1
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_DELAY = 10
+TASKS_VISIBILITY_TIMEOUT = 600
+
+STARTUP_LOCK_ID = 8212301
+STARTUP_FIXTURE = os.path.join(BASE_DIR, 'dump.json')
+STARTUP_SEED_BATCH_SIZE = 1000
+
+API_CACHE_MAX_AGE = 10
+API_CACHE_STALE_WHILE_REVALIDATE = 30
+API_CACHE_REFRESH_URL = os.getenv('API_CACHE_REFRESH_URL', '')
+API_CACHE_REFRESH_HOST = os.getenv('API_CACHE_REFRESH_HOST',
+                                   ALLOWED_HOSTS[0])
+API_CACHE_REFRESH_TIMEOUT = 2
+API_CACHE_RECIPE_LIST_PATH = '/api/recipes/?page=1&limit=6'
+
+CATALOGUE_CACHE_TIMEOUT = 300
+
+METRICS_SAMPLE_RATE = float(os.getenv('METRICS_SAMPLE_RATE', '0.1'))
+METRICS_DUPLICATE_QUERIES_THRESHOLD = 3
+METRICS_DIR = os.getenv('METRICS_DIR',
+                        os.path.join(SHARED_DIR, 'foodgram-metrics'))
+METRICS_FLUSH_INTERVAL = 1
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
@@ -114,7 +217,52 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.TokenAuthentication',
     ),
+
+    'DEFAULT_THROTTLE_CLASSES': (
+        'api.throttling.CostClassThrottle',
+    ),
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 1)),
+}
+
+RECIPE_BODY_LIMITS = {
+    'total': 10 * 1024 * 1024,
+    'fields': {
+        'image': 8 * 1024 * 1024,
+        'text': 64 * 1024,
+        'name': 1024,
+        'ingredients': 64 * 1024,
+        'tags': 4 * 1024,
+    },
+}
+REQUEST_BODY_LIMITS = {
+    'recipe.create': RECIPE_BODY_LIMITS,
+    'recipe.update': RECIPE_BODY_LIMITS,
+    'recipe.partial_update': RECIPE_BODY_LIMITS,
 }
+REQUEST_BODY_CHUNK_SIZE = 64 * 1024
+
+THROTTLE_BUCKETS = {
+    'read': (120, 20),
+    'write': (30, 1),
+    'upload': (10, 0.1),
+    'export': (5, 1 / 60),
+}
+THROTTLE_STORE = os.getenv('THROTTLE_STORE',
+                           'api.throttling.SharedMemoryBucketStore')
+THROTTLE_LOCAL_MAX_KEYS = 100000
+THROTTLE_SHARED_PATH = os.getenv(
+    'THROTTLE_SHARED_PATH', os.path.join(SHARED_DIR, 'foodgram-throttle')
+)
+THROTTLE_SHARED_SLOTS = 65536
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_ATOMIC_CACHE_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+    'django_redis.cache.RedisCache',
+)
+THROTTLE_CACHE_TIMEOUT = 24 * 60 * 60
+THROTTLE_BENCHMARK_BUDGET_US = 50
 
 DJOSER = {
     'LOGIN_FIELD': 'email',
@@ -129,6 +277,56 @@ DJOSER = {
 
 SHOPPING_LIST_FILENAME = 'shopping-list.txt'
 
+BULK_RECIPES_LIMIT = 100
+
+RECIPE_TRANSFER_CHUNK_SIZE = 2000
+RECIPE_EXPORT_FILENAME = 'recipes.ndjson'
+RECIPE_IMPORT_MAX_ERRORS = 100
+
+MASS_UNIT = 'г'
+UNIT_CONVERSIONS = {
+    'мг': (MASS_UNIT, 0.001),
+    'г': (MASS_UNIT, 1.0),
+    'кг': (MASS_UNIT, 1000.0),
+    'мл': ('мл', 1.0),
+    'л': ('мл', 1000.0),
+}
+UNIT_DENSITIES = {
+    'мл': 1.0,
+}
+UNIT_PRECISION = {
+    MASS_UNIT: 0,
+    'мл': 0,
+}
+DEFAULT_UNIT_PRECISION = 2
+NUTRITION_TABLE_TIMEOUT = 300
+NUTRITION_BENCHMARK_RECIPES = 100000
+
+FEED_PAGE_SIZE = 10
+FEED_MAX_PAGE_SIZE = 100
+FEED_TIMELINE_LENGTH = 800
+FEED_FANOUT_MAX_FOLLOWERS = 10000
+FEED_FANOUT_BATCH_SIZE = 1000
+
+RECIPE_IMAGE_WIDTHS = (160, 480, 1080)
+RECIPE_IMAGE_FORMATS = ('webp', 'jpeg')
+RECIPE_IMAGE_QUALITY = 80
+
+RANKING_FAVORITE_WEIGHT = 1.0
+RANKING_CART_WEIGHT = 0.5
+RANKING_TRENDING_HALF_LIFE_HOURS = 72
+RANKING_BATCH_SIZE = 5000
+RANKING_COMMIT_LAG = 300
+RANKING_UPDATE_INTERVAL = 5 * 60
+RANKING_FULL_UPDATE_INTERVAL = 24 * 60 * 60
+
+TASKS_SCHEDULE = {
+    'recipe-scores': ('recipes.tasks.update_recipe_scores',
+                      RANKING_UPDATE_INTERVAL, {}),
+    'recipe-scores-full': ('recipes.tasks.update_recipe_scores',
+                           RANKING_FULL_UPDATE_INTERVAL, {'full': True}),
+}
+
 MIN_AMOUNT = 1
 MAX_AMOUNT = 1000
 
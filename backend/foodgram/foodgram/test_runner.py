@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import connections
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.saved_settings = (settings.THROTTLE_BUCKETS,
+                               settings.METRICS_SAMPLE_RATE)
+        settings.THROTTLE_BUCKETS = {}
+        settings.METRICS_SAMPLE_RATE = 0
+        self.cache_settings = override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }
+        })
+        self.cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_settings.disable()
+        (settings.THROTTLE_BUCKETS,
+         settings.METRICS_SAMPLE_RATE) = self.saved_settings
+        super().teardown_test_environment(**kwargs)
+
+    def setup_databases(self, **kwargs):
+        for connection in connections.all():
+            test_settings = connection.settings_dict['TEST']
+            if connection.vendor == 'sqlite' and not test_settings['NAME']:
+                test_settings['NAME'] = os.path.join(
+                    tempfile.gettempdir(),
+                    f'foodgram-test-{connection.alias}.sqlite3'
+                )
+        return super().setup_databases(**kwargs)
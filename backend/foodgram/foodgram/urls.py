@@ -3,9 +3,14 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 
+from api.warmup import readiness_view
+from foodgram.metrics import metrics_view
+
 urlpatterns = [
     path('api/', include('api.urls')),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
+    path('ready', readiness_view, name='ready'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,94 @@
+import math
+import os
+import random
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+CGROUP_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(CGROUP_CPU_MAX) as file:
+            quota, period = file.read().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == 'max':
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
+cpu_count = available_cpus()
+workers = int(
+    os.getenv('GUNICORN_WORKERS')
+    or os.getenv('WEB_CONCURRENCY')
+    or cpu_count * 2 + 1
+)
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(
+    os.getenv('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+)
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+
+
+def close_db_connections():
+    from django.db import connections
+
+    for connection in connections.all():
+        connection.close()
+
+
+def on_starting(server):
+    from foodgram.metrics import clear_metrics
+
+    clear_metrics()
+
+
+def when_ready(server):
+    server.log.info(
+        'Workers: %s, threads: %s, class: %s, preload: %s',
+        workers, threads, worker_class, preload_app
+    )
+    if preload_app:
+        close_db_connections()
+
+
+def post_fork(server, worker):
+    random.seed()
+    close_db_connections()
+    if preload_app:
+        from api.warmup import ready, warm_up
+
+        if not ready.is_set():
+            server.log.info('Warming up worker %s', worker.pid)
+            warm_up()
+            close_db_connections()
+
+
+def worker_exit(server, worker):
+    from foodgram.metrics import registry
+
+    registry.flush()
+
+
+def child_exit(server, worker):
+    from foodgram.metrics import archive_worker
+
+    archive_worker(worker.pid)
@@ -1,12 +1,15 @@
 from django.contrib import admin
+from django.db.models import Count, OuterRef, Subquery
 
+from foodgram.pagination import EstimatedCountPaginator
 from recipes.models import (Recipe, Ingredient,
                             Tag, FavoriteRecipe,
                             RecipeIngredient, ShoppingCart)
 
 
 class IngredientAdmin(admin.ModelAdmin):
-    list_display = ('name', 'measurement_unit')
+    list_display = ('name', 'measurement_unit', 'grams_per_unit',
+                    'calories', 'price')
     list_filter = ('measurement_unit',)
     search_fields = ('name',)
 
@@ -19,17 +22,35 @@ class TagAdmin(admin.ModelAdmin):
 class RecipeIngredientInline(admin.TabularInline):
     model = RecipeIngredient
     min_num = 1
+    autocomplete_fields = ('ingredient',)
+
+    def get_queryset(self, request):
+        return (super().get_queryset(request)
+                .select_related('recipe', 'ingredient'))
 
 
 class RecipeAdmin(admin.ModelAdmin):
     list_display = ('name', 'author', 'author_email')
     list_filter = ('tags',)
+    list_select_related = ('author',)
     search_fields = ('name', 'author__username', 'author__email')
     readonly_fields = ('favorited_count',)
+    autocomplete_fields = ('author',)
     inlines = [RecipeIngredientInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        favorited = (FavoriteRecipe.objects
+                     .filter(recipe=OuterRef('pk'))
+                     .values('recipe')
+                     .annotate(total=Count('pk'))
+                     .values('total'))
+        return (super().get_queryset(request)
+                .annotate(favorited_total=Subquery(favorited)))
 
     def favorited_count(self, obj):
-        return obj.favorited_by.count()
+        return obj.favorited_total or 0
 
     favorited_count.short_description = 'Количество добавлений в избранное'
 
@@ -42,7 +63,11 @@ class RecipeAdmin(admin.ModelAdmin):
 class FavoriteRecipeAdmin(admin.ModelAdmin):
     list_display = ('recipe', 'user', 'user_email')
     list_filter = ('recipe__tags',)
+    list_select_related = ('recipe', 'user')
     search_fields = ('user__username', 'user__email', 'recipe__name')
+    autocomplete_fields = ('user', 'recipe')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def user_email(self, obj):
         return obj.user.email
@@ -54,6 +79,10 @@ class ShoppingCartAdmin(admin.ModelAdmin):
     list_display = ('recipe', 'user', 'user_email')
     search_fields = ('user__username', 'user__email')
     list_filter = ('recipe__tags',)
+    list_select_related = ('recipe', 'user')
+    autocomplete_fields = ('user', 'recipe')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def user_email(self, obj):
         return obj.user.email
@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from recipes.models import FeedEntry, Recipe
+from users.models import Subscription, User
+
+
+def is_fanned_out(author):
+    return author.followers_count <= settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+def trim_timelines(user_ids):
+    ranked = (FeedEntry.objects
+              .filter(user_id__in=user_ids)
+              .annotate(position=Window(
+                  RowNumber(),
+                  partition_by=F('user_id'),
+                  order_by=F('recipe_id').desc()
+              ))
+              .filter(position__gt=settings.FEED_TIMELINE_LENGTH)
+              .values('id'))
+    FeedEntry.objects.filter(id__in=ranked).delete()
+
+
+def fan_out_recipe(recipe):
+    if not is_fanned_out(recipe.author):
+        return
+
+    follower_ids = (Subscription.objects
+                    .filter(author_id=recipe.author_id)
+                    .values_list('user_id', flat=True)
+                    .iterator(chunk_size=settings.FEED_FANOUT_BATCH_SIZE))
+    batch = []
+    for user_id in follower_ids:
+        batch.append(user_id)
+        if len(batch) == settings.FEED_FANOUT_BATCH_SIZE:
+            push_to_timelines(batch, recipe.id)
+            batch = []
+    if batch:
+        push_to_timelines(batch, recipe.id)
+
+
+def push_to_timelines(user_ids, recipe_id):
+    FeedEntry.objects.bulk_create(
+        (FeedEntry(user_id=user_id, recipe_id=recipe_id)
+         for user_id in user_ids),
+        ignore_conflicts=True
+    )
+    trim_timelines(user_ids)
+
+
+def follow_author(user_id, author_id):
+    authors = User.objects.filter(pk=author_id)
+    authors.update(followers_count=F('followers_count') + 1)
+    followers_count = authors.values_list('followers_count',
+                                          flat=True).first()
+    if (followers_count is None
+            or followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS):
+        return
+
+    recipe_ids = (Recipe.objects
+                  .filter(author_id=author_id)
+                  .order_by('-id')
+                  .values_list('id', flat=True)
+                  [:settings.FEED_TIMELINE_LENGTH])
+    FeedEntry.objects.bulk_create(
+        (FeedEntry(user_id=user_id, recipe_id=recipe_id)
+         for recipe_id in recipe_ids),
+        ignore_conflicts=True
+    )
+    trim_timelines((user_id,))
+
+
+def unfollow_author(user_id, author_id):
+    User.objects.filter(pk=author_id, followers_count__gt=0).update(
+        followers_count=F('followers_count') - 1
+    )
+    FeedEntry.objects.filter(user_id=user_id,
+                             recipe__author_id=author_id).delete()
+
+
+def get_feed_recipe_ids(user, limit, before=None):
+    timeline = FeedEntry.objects.filter(user=user)
+    popular_recipes = Recipe.objects.filter(
+        author__in=(User.objects
+                    .filter(following__user=user,
+                            followers_count__gt=(
+                                settings.FEED_FANOUT_MAX_FOLLOWERS))
+                    .values('id'))
+    )
+    if before is not None:
+        timeline = timeline.filter(recipe_id__lt=before)
+        popular_recipes = popular_recipes.filter(id__lt=before)
+
+    pushed = timeline.order_by('-recipe_id').values_list('recipe_id',
+                                                         flat=True)
+    pulled = popular_recipes.order_by('-id').values_list('id', flat=True)
+    recipe_ids = set(pushed[:limit]) | set(pulled[:limit])
+    return sorted(recipe_ids, reverse=True)[:limit]
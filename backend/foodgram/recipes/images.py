@@ -0,0 +1,75 @@
+import io
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+VARIANTS_DIR = 'recipes/variants'
+FORMAT_EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+PUBLIC_IMAGE_FORMAT = 'jpeg'
+
+
+def build_variants(image_name):
+    from PIL import Image
+
+    with default_storage.open(image_name, 'rb') as file:
+        original = Image.open(file)
+        original.load()
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA')
+
+    variants = []
+    for width in settings.RECIPE_IMAGE_WIDTHS:
+        image = original.copy()
+        image.thumbnail((width, width * 4), Image.LANCZOS)
+        for image_format in settings.RECIPE_IMAGE_FORMATS:
+            converted = image
+            if image_format == 'jpeg' and image.mode != 'RGB':
+                converted = image.convert('RGB')
+            buffer = io.BytesIO()
+            converted.save(buffer, image_format,
+                           quality=settings.RECIPE_IMAGE_QUALITY)
+            name = default_storage.save(
+                f'{VARIANTS_DIR}/{width}/variant.'
+                f'{FORMAT_EXTENSIONS[image_format]}',
+                ContentFile(buffer.getvalue())
+            )
+            variants.append({
+                'name': name,
+                'width': image.width,
+                'height': image.height,
+                'format': image_format,
+            })
+    return variants
+
+
+def variants_representation(recipe, request=None):
+    representation = []
+    for variant in recipe.image_variants:
+        url = default_storage.url(variant['name'])
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        representation.append({
+            'url': url,
+            'width': variant['width'],
+            'height': variant['height'],
+            'format': variant['format'],
+        })
+    return representation
+
+
+def image_url(recipe, request=None):
+    if not settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        url = recipe.image.url
+    else:
+        variants = [variant for variant in recipe.image_variants
+                    if variant['format'] == PUBLIC_IMAGE_FORMAT]
+        if variants:
+            variant = max(variants, key=lambda variant: variant['width'])
+            url = default_storage.url(variant['name'])
+        else:
+            url = reverse('recipe-image', args=(recipe.id,))
+    if request is not None:
+        url = request.build_absolute_uri(url)
+    return url
@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.models import Recipe
+from recipes.nutrition import (TOTALS, IngredientTable, ingredient_table,
+                               recipe_totals)
+from recipes.units import unit_grams
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает подсчёт калорийности и стоимости рецептов '
+            'векторизованным движком и построчным циклом на Python.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int,
+                            default=settings.NUTRITION_BENCHMARK_RECIPES)
+        parser.add_argument('--ingredients', type=int, default=2000)
+        parser.add_argument('--ingredients-per-recipe', type=int, default=8)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--database', action='store_true',
+                            help='Считать рецепты из базы данных.')
+
+    def build_table(self, rng, total):
+        units = list(settings.UNIT_CONVERSIONS) + ['шт.', 'стакан']
+        rows = []
+        for ingredient_id in range(1, total + 1):
+            unit = units[ingredient_id % len(units)]
+            values = rng.uniform(0, 100, len(TOTALS))
+            values[rng.random(len(TOTALS)) < 0.05] = np.nan
+            grams = (None if unit_grams(unit) is not None
+                     else rng.uniform(50, 250))
+            rows.append((ingredient_id, unit, grams,
+                         *(None if np.isnan(value) else value
+                           for value in values)))
+        return IngredientTable(rows)
+
+    def python_totals(self, table, ingredient_ids, amounts, groups, size):
+        grams_per_unit = table.grams_per_unit.tolist()
+        per_gram = table.per_gram.tolist()
+        sums = [[0.0] * len(TOTALS) for _ in range(size)]
+        incomplete = [False] * size
+        for ingredient_id, amount, group in zip(
+                ingredient_ids.tolist(), amounts.tolist(), groups.tolist()):
+            grams = amount * grams_per_unit[ingredient_id]
+            recipe_sums = sums[group]
+            for position, value in enumerate(per_gram[ingredient_id]):
+                value *= grams
+                if value != value:
+                    incomplete[group] = True
+                else:
+                    recipe_sums[position] += value
+        return np.array(sums), np.array(incomplete)
+
+    def measure(self, title, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'{title}: {elapsed * 1000:.1f} мс')
+        return result, elapsed
+
+    def handle_database(self, size):
+        recipe_ids = list(Recipe.objects.order_by('-id')
+                          .values_list('id', flat=True)[:size])
+        self.stdout.write(f'Рецептов из базы данных: {len(recipe_ids)}')
+        ingredient_table.table = None
+        self.measure('Таблица ингредиентов', ingredient_table.get)
+        totals, _ = self.measure('Запрос и NumPy', recipe_totals, recipe_ids)
+        incomplete = sum(not total['complete'] for total in totals.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Посчитано рецептов: {len(totals)}, неполных: {incomplete}'
+        ))
+
+    def handle(self, *args, **options):
+        if options['database']:
+            return self.handle_database(options['recipes'])
+        rng = np.random.default_rng(options['seed'])
+        table = self.build_table(rng, options['ingredients'])
+        size = options['recipes']
+        rows = size * options['ingredients_per_recipe']
+        groups = np.repeat(np.arange(size),
+                           options['ingredients_per_recipe'])
+        ingredient_ids = rng.integers(1, options['ingredients'] + 1, rows)
+        amounts = rng.integers(settings.MIN_AMOUNT, 500, rows).astype(float)
+        self.stdout.write(f'Рецептов: {size}, строк ингредиентов: {rows}')
+
+        (vector_sums, vector_incomplete), vector_time = self.measure(
+            'NumPy', table.totals, ingredient_ids, amounts, groups, size
+        )
+        (loop_sums, loop_incomplete), loop_time = self.measure(
+            'Python', self.python_totals,
+            table, ingredient_ids, amounts, groups, size
+        )
+
+        if (not np.allclose(vector_sums, loop_sums)
+                or not np.array_equal(vector_incomplete, loop_incomplete)):
+            raise CommandError('Результаты NumPy и Python расходятся.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Ускорение: {loop_time / max(vector_time, 1e-9):.1f}x'
+        ))
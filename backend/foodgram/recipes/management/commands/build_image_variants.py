@@ -0,0 +1,58 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.core.management.base import BaseCommand
+
+from recipes.images import build_variants
+from recipes.models import Recipe
+
+
+def build_recipe_variants(recipe):
+    recipe_id, image_name = recipe
+    try:
+        return recipe_id, build_variants(image_name), None
+    except Exception as error:
+        return recipe_id, None, str(error)
+
+
+class Command(BaseCommand):
+    help = ('Строит уменьшенные копии изображений для рецептов, '
+            'у которых их ещё нет.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int,
+                            default=os.cpu_count() or 1)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--force', action='store_true',
+                            help='Пересоздать копии для всех рецептов.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        recipes = Recipe.objects.exclude(image='')
+        if not options['force']:
+            recipes = recipes.filter(image_variants=[])
+        recipes = recipes.values_list('id', 'image').iterator(
+            chunk_size=batch_size
+        )
+
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'],
+                                 initializer=django.setup) as executor:
+            while batch := list(islice(recipes, batch_size)):
+                updated = []
+                for recipe_id, variants, error in executor.map(
+                        build_recipe_variants, batch):
+                    if error:
+                        failed += 1
+                        self.stderr.write(f'Рецепт {recipe_id}: {error}')
+                        continue
+                    updated.append(Recipe(id=recipe_id,
+                                          image_variants=variants))
+                Recipe.objects.bulk_update(updated, ('image_variants',))
+                done += len(updated)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано рецептов: {done}, ошибок: {failed}'
+        ))
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from foodgram.import_time import best_profile, import_time_ms
+
+
+class Command(BaseCommand):
+    help = ('Профилирует импорт модулей при django.setup() через '
+            '-X importtime и завершается с ошибкой, если превышен бюджет '
+            'или при запуске импортированы модули, которые должны '
+            'загружаться лениво.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float,
+                            default=settings.IMPORT_TIME_BUDGET_MS)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--top', type=int, default=10)
+
+    def handle(self, *args, **options):
+        modules = best_profile(options['repeat'])
+        best = import_time_ms(modules)
+
+        top_level = sorted(
+            ((cumulative_us, name)
+             for name, (_, cumulative_us, depth) in modules.items()
+             if depth == 1),
+            reverse=True
+        )
+        for cumulative_us, name in top_level[:options['top']]:
+            self.stdout.write(f'{cumulative_us / 1000:8.1f} мс  {name}')
+
+        eager = sorted(name for name in settings.IMPORT_TIME_LAZY_MODULES
+                       if name in modules)
+        self.stdout.write(
+            f'Модулей: {len(modules)}, время импорта: {best:.1f} мс '
+            f'(бюджет {options["budget_ms"]:.0f} мс)'
+        )
+        if eager:
+            raise CommandError(
+                'При запуске импортированы модули, которые должны '
+                f'загружаться лениво: {", ".join(eager)}'
+            )
+        if best > options['budget_ms']:
+            raise CommandError('Превышен бюджет времени импорта.')
@@ -0,0 +1,36 @@
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes.transfer import export_recipes
+
+
+class Command(BaseCommand):
+    help = 'Выгружает рецепты с ингредиентами и тегами в формате NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o',
+                            help='Файл для выгрузки (по умолчанию stdout).')
+        parser.add_argument('--chunk-size', type=int,
+                            default=settings.RECIPE_TRANSFER_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        output = (open(options['output'], 'w', encoding='utf-8')
+                  if options['output'] else sys.stdout)
+        exported = 0
+        try:
+            for chunk in export_recipes(chunk_size=options['chunk_size']):
+                output.write(chunk)
+                exported += chunk.count('\n')
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(
+            f'Выгружено рецептов: {exported} за {elapsed:.1f} с '
+            f'({exported / max(elapsed, 1e-9):.0f} в секунду)'
+        )
@@ -0,0 +1,221 @@
+import csv
+import random
+import time
+from itertools import accumulate
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from recipes.models import (Ingredient, Tag, Recipe, RecipeIngredient,
+                            RecipeScore, FavoriteRecipe, ShoppingCart)
+from users.models import User, Subscription
+
+PLACEHOLDER_IMAGE = 'recipes/images/generated.png'
+PLACEHOLDER_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010802000000907753de'
+    '0000000c4944415478da6378f6ec1900056802b33c3817670000000049454e44ae'
+    '426082'
+)
+DEFAULT_TAGS = (
+    ('Завтрак', 'breakfast', '#E26C2D'),
+    ('Обед', 'lunch', '#49B64E'),
+    ('Ужин', 'dinner', '#8775D2'),
+)
+
+
+class Command(BaseCommand):
+    help = ('Генерирует пользователей, рецепты, избранное, списки покупок '
+            'и подписки для нагрузочного тестирования.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--recipes', type=int, default=10000)
+        parser.add_argument('--favorites-per-user', type=int, default=20)
+        parser.add_argument('--cart-per-user', type=int, default=5)
+        parser.add_argument('--follows-per-user', type=int, default=10)
+        parser.add_argument('--zipf', type=float, default=1.1,
+                            help='Показатель распределения Ципфа.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='load')
+        parser.add_argument('--ingredients-csv',
+                            help='CSV (название,единица) для пустого '
+                                 'справочника ингредиентов.')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.zipf = options['zipf']
+        self.prefix = options['prefix']
+        started = time.perf_counter()
+
+        ingredient_ids = self.load_ingredients(options['ingredients_csv'])
+        tag_ids = self.load_tags()
+        user_ids = self.step('Пользователи', self.create_users,
+                             options['users'])
+        recipe_ids = self.step('Рецепты', self.create_recipes,
+                               options['recipes'], user_ids)
+        self.step('Ингредиенты рецептов', self.create_recipe_ingredients,
+                  recipe_ids, ingredient_ids)
+        self.step('Теги рецептов', self.create_recipe_tags,
+                  recipe_ids, tag_ids)
+        self.step('Избранное', self.create_user_recipes, FavoriteRecipe,
+                  user_ids, recipe_ids, options['favorites_per_user'])
+        self.step('Списки покупок', self.create_user_recipes, ShoppingCart,
+                  user_ids, recipe_ids, options['cart_per_user'])
+        self.step('Подписки', self.create_subscriptions,
+                  user_ids, options['follows_per_user'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.perf_counter() - started:.1f} с'
+        ))
+
+    def step(self, title, func, *args):
+        started = time.perf_counter()
+        with transaction.atomic():
+            result = func(*args)
+        self.stdout.write(f'{title}: {time.perf_counter() - started:.1f} с')
+        return result
+
+    def zipf_weights(self, size):
+        return list(accumulate(
+            1 / rank ** self.zipf for rank in range(1, size + 1)
+        ))
+
+    def bulk_create(self, model, objs, **kwargs):
+        batch = []
+        for obj in objs:
+            batch.append(obj)
+            if len(batch) == self.batch_size:
+                yield from model.objects.bulk_create(batch, **kwargs)
+                batch = []
+        if batch:
+            yield from model.objects.bulk_create(batch, **kwargs)
+
+    def load_ingredients(self, csv_path):
+        if not Ingredient.objects.exists():
+            if not csv_path:
+                raise CommandError('Справочник ингредиентов пуст, '
+                                   'укажите --ingredients-csv.')
+            with open(csv_path, encoding='utf-8') as file:
+                Ingredient.objects.bulk_create(
+                    Ingredient(name=name, measurement_unit=unit)
+                    for name, unit in csv.reader(file)
+                )
+        return list(Ingredient.objects.values_list('id', flat=True))
+
+    def load_tags(self):
+        if not Tag.objects.exists():
+            Tag.objects.bulk_create(
+                Tag(name=name, slug=slug, color=color)
+                for name, slug, color in DEFAULT_TAGS
+            )
+        return list(Tag.objects.values_list('id', flat=True))
+
+    def create_users(self, total):
+        prefix = self.prefix
+        if User.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f'Пользователи с префиксом {prefix} уже '
+                               f'существуют, укажите другой --prefix.')
+        password = make_password(f'{prefix}-password')
+        users = self.bulk_create(User, (
+            User(username=f'{prefix}_{number}',
+                 email=f'{prefix}_{number}@example.com',
+                 first_name='Имя',
+                 last_name='Фамилия',
+                 password=password)
+            for number in range(total)
+        ))
+        return [user.id for user in users]
+
+    def create_recipes(self, total, user_ids):
+        image = default_storage.save(PLACEHOLDER_IMAGE,
+                                     ContentFile(PLACEHOLDER_PNG))
+        authors = self.zipf_weights(len(user_ids))
+        recipes = self.bulk_create(Recipe, (
+            Recipe(author_id=author_id,
+                   name=f'Рецепт {number}',
+                   text='Сгенерированный рецепт для нагрузочного теста.',
+                   image=image,
+                   cooking_time=self.rng.randint(
+                       settings.MIN_COOKING_TIME, 180))
+            for number, author_id in enumerate(
+                self.rng.choices(user_ids, cum_weights=authors, k=total))
+        ))
+        recipe_ids = [recipe.id for recipe in recipes]
+        for _ in self.bulk_create(RecipeScore, (
+                RecipeScore(recipe_id=recipe_id) for recipe_id in recipe_ids)):
+            pass
+        return recipe_ids
+
+    def create_recipe_ingredients(self, recipe_ids, ingredient_ids):
+        popularity = self.zipf_weights(len(ingredient_ids))
+
+        def rows():
+            for recipe_id in recipe_ids:
+                size = min(max(int(self.rng.lognormvariate(2.0, 0.4)), 1),
+                           len(ingredient_ids))
+                chosen = set()
+                while len(chosen) < size:
+                    chosen.update(self.rng.choices(
+                        ingredient_ids, cum_weights=popularity,
+                        k=size - len(chosen)
+                    ))
+                for ingredient_id in chosen:
+                    yield RecipeIngredient(
+                        recipe_id=recipe_id,
+                        ingredient_id=ingredient_id,
+                        amount=self.rng.randint(settings.MIN_AMOUNT, 500)
+                    )
+
+        for _ in self.bulk_create(RecipeIngredient, rows()):
+            pass
+
+    def create_recipe_tags(self, recipe_ids, tag_ids):
+        through = Recipe.tags.through
+        rows = (
+            through(recipe_id=recipe_id, tag_id=tag_id)
+            for recipe_id in recipe_ids
+            for tag_id in self.rng.sample(
+                tag_ids, self.rng.randint(1, min(3, len(tag_ids))))
+        )
+        for _ in self.bulk_create(through, rows):
+            pass
+
+    def create_user_recipes(self, model, user_ids, recipe_ids, per_user):
+        popularity = self.zipf_weights(len(recipe_ids))
+        rows = (
+            model(user_id=user_id, recipe_id=recipe_id)
+            for user_id in user_ids
+            for recipe_id in set(self.rng.choices(
+                recipe_ids, cum_weights=popularity, k=per_user))
+        )
+        for _ in self.bulk_create(model, rows, ignore_conflicts=True):
+            pass
+
+    def create_subscriptions(self, user_ids, per_user):
+        popularity = self.zipf_weights(len(user_ids))
+        rows = (
+            Subscription(user_id=user_id, author_id=author_id)
+            for user_id in user_ids
+            for author_id in set(self.rng.choices(
+                user_ids, cum_weights=popularity, k=per_user))
+            if author_id != user_id
+        )
+        for _ in self.bulk_create(Subscription, rows, ignore_conflicts=True):
+            pass
+
+        followers = (Subscription.objects
+                     .filter(author=OuterRef('pk'))
+                     .values('author')
+                     .annotate(total=Count('pk'))
+                     .values('total'))
+        User.objects.filter(username__startswith=f'{self.prefix}_').update(
+            followers_count=Coalesce(Subquery(followers), 0)
+        )
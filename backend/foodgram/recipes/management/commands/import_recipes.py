@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.transfer import RecipeImporter
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Загружает рецепты из файла NDJSON, выгруженного export_recipes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.RECIPE_TRANSFER_CHUNK_SIZE)
+        parser.add_argument('--default-author',
+                            help='Пользователь, которому достанутся рецепты '
+                                 'авторов, отсутствующих в базе.')
+
+    def handle(self, *args, **options):
+        default_author = None
+        if options['default_author']:
+            default_author = User.objects.filter(
+                username=options['default_author']
+            ).first()
+            if default_author is None:
+                raise CommandError('Пользователь для --default-author '
+                                   'не найден.')
+
+        started = time.perf_counter()
+        importer = RecipeImporter(default_author=default_author,
+                                  batch_size=options['batch_size'])
+        with open(options['path'], encoding='utf-8') as file:
+            created, errors = importer.run(file)
+        elapsed = time.perf_counter() - started
+
+        for number, error in errors:
+            self.stderr.write(f'Строка {number}: {error}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено рецептов: {created} за {elapsed:.1f} с '
+            f'({created / max(elapsed, 1e-9):.0f} в секунду), '
+            f'пропущено: {importer.skipped}, ошибок: {len(errors)}'
+        ))
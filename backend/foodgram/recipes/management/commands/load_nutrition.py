@@ -0,0 +1,71 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from recipes.models import Ingredient
+
+NUTRITION_FIELDS = ('grams_per_unit', 'calories', 'proteins', 'fats',
+                    'carbohydrates', 'price')
+KEY_FIELDS = ('name', 'measurement_unit')
+
+
+class Command(BaseCommand):
+    help = ('Загружает пищевую ценность, цену и вес единицы измерения '
+            'ингредиентов из CSV с заголовком (name, measurement_unit, '
+            'grams_per_unit, calories, proteins, fats, carbohydrates, '
+            'price). Пустая ячейка сбрасывает значение.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def parse_value(self, value, number, field):
+        value = value.strip().replace(',', '.')
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            raise CommandError(f'Строка {number}: некорректное значение '
+                               f'{field}: {value}')
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        ingredients = {
+            (ingredient.name, ingredient.measurement_unit): ingredient
+            for ingredient in Ingredient.objects.all()
+        }
+
+        with open(options['path'], encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            columns = reader.fieldnames or ()
+            if not all(field in columns for field in KEY_FIELDS):
+                raise CommandError('В заголовке CSV нужны колонки '
+                                   'name и measurement_unit.')
+            fields = [field for field in NUTRITION_FIELDS
+                      if field in columns]
+            if not fields:
+                raise CommandError('В CSV нет ни одной колонки с данными: '
+                                   f'{", ".join(NUTRITION_FIELDS)}.')
+
+            updated = {}
+            unknown = 0
+            for number, row in enumerate(reader, start=2):
+                ingredient = ingredients.get(
+                    (row['name'].strip(), row['measurement_unit'].strip())
+                )
+                if ingredient is None:
+                    unknown += 1
+                    continue
+                for field in fields:
+                    setattr(ingredient, field,
+                            self.parse_value(row[field], number, field))
+                updated[ingredient.pk] = ingredient
+
+        Ingredient.objects.bulk_update(updated.values(), fields,
+                                       batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено ингредиентов: {len(updated)}, '
+            f'не найдено в справочнике: {unknown}'
+        ))
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from recipes.seed import seed_fixture
+
+
+@contextmanager
+def advisory_lock(connection, lock_id):
+    if connection.vendor != 'postgresql':
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_lock(%s)', (lock_id,))
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(%s)', (lock_id,))
+
+
+def migration_plan(connection):
+    executor = MigrationExecutor(connection)
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+def static_manifest_hash():
+    files = []
+    for finder in get_finders():
+        for path, storage in finder.list(['CVS', '.*', '*~']):
+            prefix = getattr(storage, 'prefix', None) or ''
+            files.append((os.path.join(prefix, path), storage.path(path)))
+
+    digest = hashlib.sha256()
+    for name, full_path in sorted(files):
+        stat = os.stat(full_path)
+        digest.update(f'{name}\0{stat.st_size}\0{stat.st_mtime_ns}\n'
+                      .encode())
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = ('Подготавливает контейнер к запуску: применяет миграции, '
+            'собирает статику и загружает начальные данные только '
+            'если что-то изменилось.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--fixture', default=settings.STARTUP_FIXTURE)
+        parser.add_argument('--force', action='store_true',
+                            help='Выполнить все шаги без проверок.')
+
+    def handle(self, *args, **options):
+        self.force = options['force']
+        connection = connections[options['database']]
+        started = time.perf_counter()
+
+        with advisory_lock(connection, settings.STARTUP_LOCK_ID):
+            self.phase('Миграции', self.migrate, connection,
+                       options['database'])
+            self.phase('Начальные данные', self.seed, options['fixture'])
+        self.phase('Статика', self.collectstatic)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Запуск подготовлен за {time.perf_counter() - started:.2f} с'
+        ))
+
+    def phase(self, title, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        self.stdout.write(
+            f'{title}: {result} ({time.perf_counter() - started:.2f} с)'
+        )
+
+    def migrate(self, connection, database):
+        plan = migration_plan(connection)
+        if not plan and not self.force:
+            return 'пропущено, новых миграций нет'
+        call_command('migrate', database=database, interactive=False,
+                     verbosity=0)
+        return f'применено миграций: {len(plan)}'
+
+    def seed(self, fixture):
+        if not os.path.exists(fixture):
+            return f'пропущено, файл {fixture} не найден'
+        total = seed_fixture(fixture, force=self.force)
+        if total is None:
+            return 'пропущено, контрольная сумма не изменилась'
+        return f'загружено объектов: {total}'
+
+    def collectstatic(self):
+        target = settings.STATIC_SYNC_DIR or settings.STATIC_ROOT
+        manifest = os.path.join(target, settings.STATIC_MANIFEST_NAME)
+        current = static_manifest_hash()
+        if not self.force and os.path.exists(manifest):
+            with open(manifest) as file:
+                if file.read().strip() == current:
+                    return 'пропущено, файлы не изменились'
+
+        call_command('collectstatic', interactive=False, verbosity=0)
+        if settings.STATIC_SYNC_DIR:
+            shutil.copytree(settings.STATIC_ROOT, settings.STATIC_SYNC_DIR,
+                            dirs_exist_ok=True)
+        with open(manifest, 'w') as file:
+            file.write(current)
+        return 'собрано'
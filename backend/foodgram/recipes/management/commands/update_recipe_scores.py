@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from recipes.ranking import update_scores
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рейтинги popular/trending по добавлениям '
+            'в избранное и список покупок с момента прошлого запуска.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать все рейтинги заново (учитывает удаления).'
+        )
+
+    def handle(self, *args, **options):
+        updated, full = update_scores(full=options['full'])
+        mode = 'полный' if full else 'инкрементальный'
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчёт ({mode}) завершён, обновлено рецептов: {updated}'
+        ))
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.4 on 2026-10-19 09:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0016_feedentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('processed_until', models.DateTimeField(verbose_name='Учтены события до')),
+                ('epoch', models.DateTimeField(verbose_name='Точка отсчёта затухания')),
+            ],
+            options={
+                'verbose_name': 'Состояние пересчёта рейтингов',
+                'verbose_name_plural': 'Состояния пересчёта рейтингов',
+            },
+        ),
+        migrations.AddField(
+            model_name='favoriterecipe',
+            name='added_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now, verbose_name='Дата добавления'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='shoppingcart',
+            name='added_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now, verbose_name='Дата добавления'),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name='RecipeScore',
+            fields=[
+                ('recipe', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score', serialize=False, to='recipes.recipe', verbose_name='Рецепт')),
+                ('popular', models.FloatField(default=0, verbose_name='Популярность')),
+                ('trending', models.FloatField(default=0, verbose_name='Актуальность')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг рецепта',
+                'verbose_name_plural': 'Рейтинги рецептов',
+                'indexes': [models.Index(fields=['-popular', '-recipe'], name='recipe_score_popular_idx'), models.Index(fields=['-trending', '-recipe'], name='recipe_score_trending_idx')],
+            },
+        ),
+    ]
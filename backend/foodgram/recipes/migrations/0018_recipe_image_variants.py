@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0017_ranking_scores'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Уменьшенные копии изображения'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.4 on 2026-10-19 09:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0019_recipe_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeedChecksum',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Файл начальных данных')),
+                ('checksum', models.CharField(max_length=64, verbose_name='SHA-256')),
+                ('loaded_at', models.DateTimeField(auto_now=True, verbose_name='Дата загрузки')),
+            ],
+            options={
+                'verbose_name': 'Загруженные начальные данные',
+                'verbose_name_plural': 'Загруженные начальные данные',
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.4 on 2026-10-19 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0020_seedchecksum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='calories',
+            field=models.FloatField(blank=True, null=True, verbose_name='Калорийность, ккал на 100 г'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='carbohydrates',
+            field=models.FloatField(blank=True, null=True, verbose_name='Углеводы, г на 100 г'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='fats',
+            field=models.FloatField(blank=True, null=True, verbose_name='Жиры, г на 100 г'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='grams_per_unit',
+            field=models.FloatField(blank=True, null=True, verbose_name='Граммов в единице измерения'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='price',
+            field=models.FloatField(blank=True, null=True, verbose_name='Цена, руб. за 1 кг'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='proteins',
+            field=models.FloatField(blank=True, null=True, verbose_name='Белки, г на 100 г'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.4 on 2026-10-19 09:42
+
+from functools import lru_cache
+from heapq import nlargest
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def backfill_feed_entries(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Subscription = apps.get_model('users', 'Subscription')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    FeedEntry = apps.get_model('recipes', 'FeedEntry')
+
+    followers = (Subscription.objects
+                 .filter(author=OuterRef('pk'))
+                 .values('author')
+                 .annotate(total=Count('pk'))
+                 .values('total'))
+    User.objects.update(followers_count=Coalesce(Subquery(followers), 0))
+
+    @lru_cache(maxsize=10000)
+    def latest_recipes(author_id):
+        return tuple(Recipe.objects
+                     .filter(author_id=author_id)
+                     .order_by('-id')
+                     .values_list('id', flat=True)
+                     [:settings.FEED_TIMELINE_LENGTH])
+
+    subscriptions = (Subscription.objects
+                     .filter(author__followers_count__lte=(
+                         settings.FEED_FANOUT_MAX_FOLLOWERS))
+                     .order_by('user_id')
+                     .values_list('user_id', 'author_id')
+                     .iterator(chunk_size=BATCH_SIZE))
+    entries = []
+    for user_id, rows in groupby(subscriptions, key=itemgetter(0)):
+        recipe_ids = nlargest(
+            settings.FEED_TIMELINE_LENGTH,
+            (recipe_id for _, author_id in rows
+             for recipe_id in latest_recipes(author_id))
+        )
+        entries.extend(FeedEntry(user_id=user_id, recipe_id=recipe_id)
+                       for recipe_id in recipe_ids)
+        if len(entries) >= BATCH_SIZE:
+            FeedEntry.objects.bulk_create(entries, ignore_conflicts=True)
+            entries = []
+    FeedEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0021_ingredient_nutrition'),
+        ('users', '0008_user_username_prefix_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_feed_entries,
+                             migrations.RunPython.noop),
+    ]
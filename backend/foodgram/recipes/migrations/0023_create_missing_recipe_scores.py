@@ -0,0 +1,31 @@
+# Generated by Django 4.2.4 on 2026-10-19 10:15
+
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+
+def create_missing_scores(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    RecipeScore = apps.get_model('recipes', 'RecipeScore')
+    recipe_ids = (Recipe.objects
+                  .filter(score__isnull=True)
+                  .values_list('id', flat=True)
+                  .iterator(chunk_size=BATCH_SIZE))
+    RecipeScore.objects.bulk_create(
+        (RecipeScore(recipe_id=recipe_id) for recipe_id in recipe_ids),
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0022_backfill_feed_entries'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_scores,
+                             migrations.RunPython.noop),
+    ]
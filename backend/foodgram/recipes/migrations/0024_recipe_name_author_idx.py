@@ -0,0 +1,17 @@
+# Generated by Django 4.2.4 on 2026-10-19 10:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0023_create_missing_recipe_scores'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['name', 'author'], name='recipe_name_author_idx'),
+        ),
+    ]
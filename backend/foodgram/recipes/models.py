@@ -11,6 +11,21 @@ class Ingredient(models.Model):
                             verbose_name='Название ингредиента')
     measurement_unit = models.CharField(max_length=200,
                                         verbose_name='Единица измерения')
+    grams_per_unit = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Граммов в единице измерения'
+    )
+    calories = models.FloatField(null=True, blank=True,
+                                 verbose_name='Калорийность, ккал на 100 г')
+    proteins = models.FloatField(null=True, blank=True,
+                                 verbose_name='Белки, г на 100 г')
+    fats = models.FloatField(null=True, blank=True,
+                             verbose_name='Жиры, г на 100 г')
+    carbohydrates = models.FloatField(null=True, blank=True,
+                                      verbose_name='Углеводы, г на 100 г')
+    price = models.FloatField(null=True, blank=True,
+                              verbose_name='Цена, руб. за 1 кг')
 
     def __str__(self):
         return self.name
@@ -52,6 +67,17 @@ class Recipe(models.Model):
         upload_to='recipes/images/',
         verbose_name='Изображение рецепта'
     )
+    image_variants = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии изображения'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Дата изменения'
+    )
     cooking_time = models.PositiveSmallIntegerField(
         verbose_name='Время приготовления (в минутах)',
         validators=(
@@ -73,6 +99,10 @@ class Recipe(models.Model):
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
         ordering = ['-id']
+        indexes = (
+            models.Index(fields=('name', 'author'),
+                         name='recipe_name_author_idx'),
+        )
 
 
 class RecipeIngredient(models.Model):
@@ -123,6 +153,11 @@ class FavoriteRecipe(models.Model):
         related_name='favorited_by',
         verbose_name='Избранный рецепт'
     )
+    added_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Дата добавления'
+    )
 
     def __str__(self):
         return f"{self.user.username} - {self.recipe.name}"
@@ -151,6 +186,11 @@ class ShoppingCart(models.Model):
         related_name='users_cart',
         verbose_name='Рецепты'
     )
+    added_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Дата добавления'
+    )
 
     def __str__(self):
         return f'Корзина покупок для {self.user}'
@@ -164,3 +204,88 @@ class ShoppingCart(models.Model):
                 name='uniq_cart_recipe'
             ),
         )
+
+
+class FeedEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Пользователь'
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Рецепт'
+    )
+
+    def __str__(self):
+        return f'Лента {self.user_id}: рецепт {self.recipe_id}'
+
+    class Meta:
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'recipe'),
+                name='uniq_feed_recipe'
+            ),
+        )
+
+
+class RecipeScore(models.Model):
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score',
+        verbose_name='Рецепт'
+    )
+    popular = models.FloatField(default=0, verbose_name='Популярность')
+    trending = models.FloatField(default=0, verbose_name='Актуальность')
+
+    def __str__(self):
+        return f'Рейтинг рецепта {self.recipe_id}'
+
+    class Meta:
+        verbose_name = 'Рейтинг рецепта'
+        verbose_name_plural = 'Рейтинги рецептов'
+        indexes = (
+            models.Index(fields=('-popular', '-recipe'),
+                         name='recipe_score_popular_idx'),
+            models.Index(fields=('-trending', '-recipe'),
+                         name='recipe_score_trending_idx'),
+        )
+
+
+class RankingCheckpoint(models.Model):
+    processed_until = models.DateTimeField(
+        verbose_name='Учтены события до'
+    )
+    epoch = models.DateTimeField(verbose_name='Точка отсчёта затухания')
+
+    def __str__(self):
+        return f'Рейтинги пересчитаны до {self.processed_until}'
+
+    class Meta:
+        verbose_name = 'Состояние пересчёта рейтингов'
+        verbose_name_plural = 'Состояния пересчёта рейтингов'
+
+
+class SeedChecksum(models.Model):
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Файл начальных данных'
+    )
+    checksum = models.CharField(max_length=64, verbose_name='SHA-256')
+    loaded_at = models.DateTimeField(auto_now=True,
+                                     verbose_name='Дата загрузки')
+
+    def __str__(self):
+        return f'{self.name}: {self.checksum}'
+
+    class Meta:
+        verbose_name = 'Загруженные начальные данные'
+        verbose_name_plural = 'Загруженные начальные данные'
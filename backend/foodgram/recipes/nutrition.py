@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from recipes.models import Ingredient, RecipeIngredient
+from recipes.units import unit_grams
+
+NUTRIENTS = ('calories', 'proteins', 'fats', 'carbohydrates')
+TOTALS = NUTRIENTS + ('cost',)
+TOTAL_SCALES = (0.01,) * len(NUTRIENTS) + (0.001,)
+TOTAL_PRECISION = {
+    'calories': 1,
+    'proteins': 1,
+    'fats': 1,
+    'carbohydrates': 1,
+    'cost': 2,
+}
+INGREDIENT_TABLE_FIELDS = ('id', 'measurement_unit', 'grams_per_unit',
+                           *NUTRIENTS, 'price')
+
+
+class IngredientTable:
+    def __init__(self, rows):
+        ids = np.array([row[0] for row in rows], dtype=np.intp)
+        grams = np.array([unit_grams(unit) if grams is None else grams
+                          for _, unit, grams, *_ in rows], dtype=float)
+        values = np.array([row[3:] for row in rows], dtype=float)
+        values = values.reshape(len(rows), len(TOTALS))
+
+        size = ids.max(initial=0) + 1
+        self.grams_per_unit = np.full(size, np.nan)
+        self.grams_per_unit[ids] = grams
+        self.per_gram = np.full((size, len(TOTALS)), np.nan)
+        self.per_gram[ids] = values * TOTAL_SCALES
+        self.version = hashlib.md5(
+            self.grams_per_unit.tobytes() + self.per_gram.tobytes(),
+            usedforsecurity=False
+        ).hexdigest()
+
+    def totals(self, ingredient_ids, amounts, groups=None, size=1):
+        ingredient_ids = np.asarray(ingredient_ids, dtype=np.intp)
+        known = ingredient_ids < len(self.grams_per_unit)
+        ingredient_ids = np.where(known, ingredient_ids, 0)
+        grams = np.where(
+            known,
+            np.asarray(amounts, dtype=float)
+            * self.grams_per_unit[ingredient_ids],
+            np.nan
+        )
+        values = grams[:, np.newaxis] * self.per_gram[ingredient_ids]
+        missing = np.isnan(values)
+        values[missing] = 0
+
+        if groups is None:
+            groups = np.zeros(len(ingredient_ids), dtype=np.intp)
+        cells = (groups[:, np.newaxis] * len(TOTALS)
+                 + np.arange(len(TOTALS)))
+        sums = np.bincount(cells.ravel(), weights=values.ravel(),
+                           minlength=size * len(TOTALS))
+        incomplete = np.bincount(groups, weights=missing.any(axis=1),
+                                 minlength=size)
+        return sums.reshape(size, len(TOTALS)), incomplete > 0
+
+
+class IngredientTableCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.table = None
+        self.built_at = 0.0
+
+    def is_stale(self):
+        return (self.table is None
+                or time.monotonic() - self.built_at
+                > settings.NUTRITION_TABLE_TIMEOUT)
+
+    def get(self):
+        if self.is_stale():
+            with self.lock:
+                if self.is_stale():
+                    self.table = IngredientTable(list(
+                        Ingredient.objects.values_list(
+                            *INGREDIENT_TABLE_FIELDS
+                        )
+                    ))
+                    self.built_at = time.monotonic()
+        return self.table
+
+
+ingredient_table = IngredientTableCache()
+
+
+def totals_representation(sums, incomplete):
+    data = {
+        name: round(float(value), TOTAL_PRECISION[name])
+        for name, value in zip(TOTALS, sums)
+    }
+    data['complete'] = not incomplete
+    return data
+
+
+def ingredient_totals(rows):
+    rows = np.array(rows, dtype=float).reshape(-1, 2)
+    sums, incomplete = ingredient_table.get().totals(rows[:, 0], rows[:, 1])
+    return totals_representation(sums[0], incomplete[0])
+
+
+def recipe_totals(recipe_ids):
+    rows = np.array(
+        RecipeIngredient.objects
+        .filter(recipe_id__in=recipe_ids)
+        .values_list('recipe_id', 'ingredient_id', 'amount'),
+        dtype=float
+    ).reshape(-1, 3)
+    recipes, groups = np.unique(rows[:, 0].astype(np.intp),
+                                return_inverse=True)
+    sums, incomplete = ingredient_table.get().totals(
+        rows[:, 1], rows[:, 2], groups.ravel(), len(recipes)
+    )
+    return {
+        int(recipe_id): totals_representation(recipe_sums, recipe_incomplete)
+        for recipe_id, recipe_sums, recipe_incomplete
+        in zip(recipes, sums, incomplete)
+    }
@@ -0,0 +1,117 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from recipes.models import (FavoriteRecipe, ShoppingCart, Recipe,
+                            RecipeScore, RankingCheckpoint)
+
+MAX_EPOCH_HALF_LIVES = 512
+
+
+def event_sources():
+    return (
+        (FavoriteRecipe, settings.RANKING_FAVORITE_WEIGHT),
+        (ShoppingCart, settings.RANKING_CART_WEIGHT),
+    )
+
+
+def decay_weight(added_at, epoch):
+    half_life = timedelta(hours=settings.RANKING_TRENDING_HALF_LIFE_HOURS)
+    return 2 ** ((added_at - epoch) / half_life)
+
+
+def collect_scores(epoch, since=None, until=None):
+    scores = defaultdict(lambda: [0.0, 0.0])
+    for model, weight in event_sources():
+        events = model.objects.all()
+        if since is not None:
+            events = events.filter(added_at__gt=since)
+        if until is not None:
+            events = events.filter(added_at__lte=until)
+
+        events = (events
+                  .values_list('recipe_id', 'added_at')
+                  .iterator(chunk_size=settings.RANKING_BATCH_SIZE))
+        for recipe_id, added_at in events:
+            score = scores[recipe_id]
+            score[0] += weight
+            score[1] += weight * decay_weight(added_at, epoch)
+    return scores
+
+
+def create_missing_scores():
+    recipe_ids = (Recipe.objects
+                  .filter(score__isnull=True)
+                  .values_list('id', flat=True)
+                  .iterator(chunk_size=settings.RANKING_BATCH_SIZE))
+    RecipeScore.objects.bulk_create(
+        (RecipeScore(recipe_id=recipe_id) for recipe_id in recipe_ids),
+        batch_size=settings.RANKING_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def save_scores(scores, incremental):
+    recipe_ids = list(scores)
+    for start in range(0, len(recipe_ids), settings.RANKING_BATCH_SIZE):
+        batch = recipe_ids[start:start + settings.RANKING_BATCH_SIZE]
+        current = {}
+        if incremental:
+            current = {
+                recipe_id: (popular, trending)
+                for recipe_id, popular, trending in (
+                    RecipeScore.objects
+                    .filter(recipe_id__in=batch)
+                    .values_list('recipe_id', 'popular', 'trending')
+                )
+            }
+
+        rows = []
+        for recipe_id in batch:
+            popular, trending = current.get(recipe_id, (0.0, 0.0))
+            delta_popular, delta_trending = scores[recipe_id]
+            rows.append(RecipeScore(
+                recipe_id=recipe_id,
+                popular=popular + delta_popular,
+                trending=trending + delta_trending,
+            ))
+        RecipeScore.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=('recipe',),
+            update_fields=('popular', 'trending'),
+        )
+
+
+@transaction.atomic
+def update_scores(full=False):
+    now = timezone.now() - timedelta(seconds=settings.RANKING_COMMIT_LAG)
+    checkpoint = (RankingCheckpoint.objects
+                  .select_for_update().order_by('pk').first())
+    half_life = timedelta(hours=settings.RANKING_TRENDING_HALF_LIFE_HOURS)
+
+    if (checkpoint is None
+            or now - checkpoint.epoch > half_life * MAX_EPOCH_HALF_LIVES):
+        full = True
+
+    if full:
+        epoch = now
+        scores = collect_scores(epoch, until=now)
+        RecipeScore.objects.update(popular=0, trending=0)
+        create_missing_scores()
+        save_scores(scores, incremental=False)
+    else:
+        epoch = checkpoint.epoch
+        scores = collect_scores(epoch, since=checkpoint.processed_until,
+                                until=now)
+        save_scores(scores, incremental=True)
+
+    if checkpoint is None:
+        checkpoint = RankingCheckpoint(processed_until=now, epoch=epoch)
+    checkpoint.processed_until = now
+    checkpoint.epoch = epoch
+    checkpoint.save()
+    return len(scores), full
@@ -0,0 +1,80 @@
+import hashlib
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from recipes.models import SeedChecksum
+from recipes.ranking import create_missing_scores
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while chunk := file.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def group_by_model(objects):
+    grouped = defaultdict(lambda: ([], defaultdict(list)))
+    for deserialized in objects:
+        instances, relations = grouped[type(deserialized.object)]
+        instances.append(deserialized.object)
+        for name, related_ids in (deserialized.m2m_data or {}).items():
+            relations[name].append((deserialized.object.pk, related_ids))
+    return grouped
+
+
+def m2m_rows(model, name, relations):
+    field = model._meta.get_field(name)
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+    return through, [
+        through(**{f'{source}_id': pk, f'{target}_id': related_id})
+        for pk, related_ids in relations
+        for related_id in related_ids
+    ]
+
+
+def seed_fixture(path, force=False):
+    name = os.path.basename(path)
+    checksum = file_checksum(path)
+    if not force and SeedChecksum.objects.filter(
+            name=name, checksum=checksum).exists():
+        return None
+
+    batch_size = settings.STARTUP_SEED_BATCH_SIZE
+    with open(path, encoding='utf-8') as file:
+        grouped = group_by_model(
+            serializers.deserialize('json', file, ignorenonexistent=True)
+        )
+
+    total = 0
+    with transaction.atomic():
+        for model, (instances, relations) in grouped.items():
+            model.objects.bulk_create(instances, batch_size=batch_size,
+                                      ignore_conflicts=True)
+            total += len(instances)
+            for field_name, field_relations in relations.items():
+                through, rows = m2m_rows(model, field_name, field_relations)
+                through.objects.bulk_create(rows, batch_size=batch_size,
+                                            ignore_conflicts=True)
+
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(), list(grouped)
+        )
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+        create_missing_scores()
+        SeedChecksum.objects.update_or_create(
+            name=name, defaults={'checksum': checksum}
+        )
+    return total
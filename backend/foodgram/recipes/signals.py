@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from recipes.feed import follow_author, unfollow_author
+from recipes.models import Recipe, RecipeScore
+from recipes.tasks import build_recipe_image_variants, fan_out_recipe
+from tasks.queue import enqueue
+from users.models import Subscription
+
+
+@receiver(post_save, sender=Subscription)
+def add_follower(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        follow_author(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Subscription)
+def remove_follower(sender, instance, **kwargs):
+    unfollow_author(instance.user_id, instance.author_id)
+
+
+@receiver(post_save, sender=Recipe)
+def set_up_created_recipe(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        RecipeScore.objects.bulk_create((RecipeScore(recipe=instance),),
+                                        ignore_conflicts=True)
+        enqueue(fan_out_recipe, idempotency_key=f'fan-out:{instance.id}',
+                recipe_id=instance.id)
+
+
+@receiver(pre_save, sender=Recipe)
+def check_image_change(sender, instance, raw=False, update_fields=None,
+                       **kwargs):
+    instance._image_changed = False
+    if raw or (update_fields is not None and 'image' not in update_fields):
+        return
+    if instance.pk is None:
+        instance._image_changed = (bool(instance.image)
+                                   and not instance.image_variants)
+        return
+    previous = (Recipe.objects.filter(pk=instance.pk)
+                .values_list('image', flat=True).first())
+    if previous != instance.image.name:
+        instance._image_changed = bool(instance.image)
+        instance.image_variants = []
+
+
+@receiver(post_save, sender=Recipe)
+def build_image_variants(sender, instance, raw=False, update_fields=None,
+                         **kwargs):
+    if raw or not getattr(instance, '_image_changed', False):
+        return
+    image_name = instance.image.name
+    if update_fields is not None and 'image_variants' not in update_fields:
+        Recipe.objects.filter(pk=instance.pk).update(image_variants=[])
+    enqueue(build_recipe_image_variants,
+            idempotency_key=(f'image-variants:{instance.id}:{image_name}:'
+                             f'{instance.updated_at.timestamp()}'),
+            recipe_id=instance.id, image_name=image_name)
@@ -0,0 +1,37 @@
+from django.utils import timezone
+
+from recipes import feed
+from recipes.images import build_variants
+from recipes.models import Recipe
+from recipes.ranking import update_scores
+
+
+def build_recipe_image_variants(recipe_id, image_name):
+    variants = build_variants(image_name)
+    Recipe.objects.filter(pk=recipe_id, image=image_name).update(
+        image_variants=variants, updated_at=timezone.now()
+    )
+
+
+def fan_out_recipe(recipe_id):
+    recipe = (Recipe.objects
+              .select_related('author')
+              .only('id', 'author__followers_count')
+              .filter(pk=recipe_id)
+              .first())
+    if recipe is not None:
+        feed.fan_out_recipe(recipe)
+
+
+def fan_out_recipes(recipe_ids):
+    recipes = (Recipe.objects
+               .select_related('author')
+               .only('id', 'author__followers_count')
+               .filter(pk__in=recipe_ids)
+               .order_by('id'))
+    for recipe in recipes:
+        feed.fan_out_recipe(recipe)
+
+
+def update_recipe_scores(full=False):
+    update_scores(full=full)
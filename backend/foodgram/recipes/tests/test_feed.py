@@ -0,0 +1,65 @@
+from django.test import TestCase
+
+from recipes.feed import get_feed_recipe_ids
+from recipes.models import Recipe
+from recipes.tasks import fan_out_recipe, fan_out_recipes
+from recipes.transfer import RecipeImporter
+from tasks.models import Task
+from users.models import Subscription, User
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user(
+            username='reader', email='reader@example.com',
+            password='secret-pass'
+        )
+        cls.author = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+
+    def create_recipe(self, name='Блины'):
+        return Recipe.objects.create(
+            author=self.author, name=name, text='Пожарить.',
+            image='recipes/images/pancakes.png', cooking_time=30
+        )
+
+    def run_task(self, func):
+        task = Task.objects.get(name=f'{func.__module__}.{func.__qualname__}')
+        func(**task.kwargs)
+
+    def test_subscription_signals_maintain_followers_count(self):
+        recipe = self.create_recipe()
+        subscription = Subscription.objects.create(user=self.reader,
+                                                   author=self.author)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 1)
+        self.assertEqual(get_feed_recipe_ids(self.reader, 10), [recipe.id])
+
+        subscription.delete()
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+        self.assertEqual(get_feed_recipe_ids(self.reader, 10), [])
+
+    def test_follower_deletion_updates_count(self):
+        Subscription.objects.create(user=self.reader, author=self.author)
+        self.reader.delete()
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+
+    def test_created_recipe_is_fanned_out(self):
+        Subscription.objects.create(user=self.reader, author=self.author)
+        recipe = self.create_recipe()
+        self.run_task(fan_out_recipe)
+        self.assertEqual(get_feed_recipe_ids(self.reader, 10), [recipe.id])
+
+    def test_imported_recipes_are_fanned_out(self):
+        Subscription.objects.create(user=self.reader, author=self.author)
+        RecipeImporter().run([
+            '{"author": "cook", "name": "Блины", "text": "Пожарить.", '
+            '"image": "recipes/images/pancakes.png", "cooking_time": 30}'
+        ])
+        self.run_task(fan_out_recipes)
+        self.assertEqual(get_feed_recipe_ids(self.reader, 10),
+                         list(Recipe.objects.values_list('id', flat=True)))
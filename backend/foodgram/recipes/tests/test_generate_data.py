@@ -0,0 +1,28 @@
+import io
+import shutil
+import tempfile
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from recipes.models import Ingredient, Recipe
+
+
+class GenerateDataTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        Ingredient.objects.create(name='мука', measurement_unit='г')
+
+    def test_recipes_point_at_stored_image(self):
+        call_command('generate_data', users=3, recipes=5,
+                     favorites_per_user=1, cart_per_user=1,
+                     follows_per_user=1, prefix='test', stdout=io.StringIO())
+
+        names = set(Recipe.objects.values_list('image', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertTrue(default_storage.exists(names.pop()))
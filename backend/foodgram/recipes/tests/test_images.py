@@ -0,0 +1,113 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from recipes.models import Recipe
+from recipes.tasks import build_recipe_image_variants
+from tasks.models import Task
+from users.models import User
+
+VARIANT = {'name': 'recipes/variants/320/variant.webp', 'width': 320,
+           'height': 240, 'format': 'webp'}
+
+
+class ImageVariantsSignalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+
+    def setUp(self):
+        self.recipe = Recipe.objects.create(
+            author=self.user, name='Блины', text='Текст.',
+            image='recipes/images/first.png', cooking_time=10
+        )
+
+    def queued_images(self):
+        return list(Task.objects
+                    .filter(idempotency_key__startswith='image-variants:')
+                    .order_by('id')
+                    .values_list('kwargs__image_name', flat=True))
+
+    def test_created_recipe_is_queued(self):
+        self.assertEqual(self.queued_images(), ['recipes/images/first.png'])
+
+    def test_unchanged_image_is_not_queued(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            image_variants=[VARIANT]
+        )
+        self.recipe.refresh_from_db()
+        self.recipe.name = 'Оладьи'
+        self.recipe.save()
+        self.assertEqual(len(self.queued_images()), 1)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.image_variants, [VARIANT])
+
+    def test_changed_image_is_queued(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            image_variants=[VARIANT]
+        )
+        self.recipe.refresh_from_db()
+        self.recipe.image = 'recipes/images/second.png'
+        self.recipe.save()
+        self.assertEqual(self.queued_images(),
+                         ['recipes/images/first.png',
+                          'recipes/images/second.png'])
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.image_variants, [])
+
+    def test_switching_back_to_previous_image_is_queued(self):
+        for image in ('recipes/images/second.png',
+                      'recipes/images/first.png'):
+            self.recipe.image = image
+            self.recipe.save()
+        self.assertEqual(self.queued_images(),
+                         ['recipes/images/first.png',
+                          'recipes/images/second.png',
+                          'recipes/images/first.png'])
+
+    def test_update_fields_with_image_clears_variants(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            image_variants=[VARIANT]
+        )
+        self.recipe.refresh_from_db()
+        self.recipe.image = 'recipes/images/second.png'
+        self.recipe.save(update_fields=('name', 'image'))
+        self.assertEqual(len(self.queued_images()), 2)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.image_variants, [])
+
+    def test_update_fields_without_image(self):
+        self.recipe.image = 'recipes/images/second.png'
+        self.recipe.save(update_fields=('name',))
+        self.assertEqual(len(self.queued_images()), 1)
+
+
+class ImageVariantsTaskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+        cls.recipe = Recipe.objects.create(
+            author=cls.user, name='Блины', text='Текст.',
+            image='recipes/images/first.png', cooking_time=10
+        )
+
+    def test_etag_changes_when_variants_are_built(self):
+        url = f'/api/recipes/{self.recipe.id}/'
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=1)
+        )
+        etag = self.client.get(url)['ETag']
+        with mock.patch('recipes.tasks.build_variants',
+                        return_value=[VARIANT]):
+            build_recipe_image_variants(self.recipe.id,
+                                        'recipes/images/first.png')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['image_variants']), 1)
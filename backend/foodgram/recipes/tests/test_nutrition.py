@@ -0,0 +1,82 @@
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from recipes.models import Ingredient, Recipe, RecipeIngredient
+from recipes.nutrition import IngredientTable, ingredient_table, recipe_totals
+from users.models import User
+
+FLOUR = (1, 'г', None, 100.0, 10.0, 5.0, 20.0, 200.0)
+EGG = (2, 'шт.', 50.0, 200.0, None, 10.0, 1.0, 100.0)
+
+
+class IngredientTableTests(SimpleTestCase):
+    def setUp(self):
+        self.table = IngredientTable([FLOUR, EGG])
+
+    def test_grouped_totals(self):
+        sums, incomplete = self.table.totals(
+            [1, 2, 1], [200, 2, 100], np.array([0, 1, 0]), 2
+        )
+        np.testing.assert_allclose(sums[0], [300, 30, 15, 60, 60])
+        np.testing.assert_allclose(sums[1], [200, 0, 10, 1, 10])
+        self.assertEqual(incomplete.tolist(), [False, True])
+
+    def test_unknown_ingredient_is_incomplete(self):
+        sums, incomplete = self.table.totals([1, 99], [100, 1])
+        np.testing.assert_allclose(sums[0], [100, 10, 5, 20, 20])
+        self.assertTrue(incomplete[0])
+
+    def test_version_follows_values(self):
+        changed = IngredientTable([FLOUR, EGG[:3] + (250.0,) + EGG[4:]])
+        self.assertEqual(self.table.version,
+                         IngredientTable([FLOUR, EGG]).version)
+        self.assertNotEqual(self.table.version, changed.version)
+
+
+class RecipeNutritionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+        cls.flour = Ingredient.objects.create(
+            name='мука', measurement_unit='г', calories=100, proteins=10,
+            fats=5, carbohydrates=20, price=200
+        )
+        cls.recipe = Recipe.objects.create(
+            author=cls.user, name='Блины', text='Текст.',
+            image='recipes/images/recipe.png', cooking_time=10
+        )
+        RecipeIngredient.objects.create(recipe=cls.recipe,
+                                        ingredient=cls.flour, amount=300)
+
+    def setUp(self):
+        ingredient_table.table = None
+        self.addCleanup(setattr, ingredient_table, 'table', None)
+        self.url = f'/api/recipes/{self.recipe.id}/'
+
+    def test_recipe_totals(self):
+        totals = recipe_totals([self.recipe.id])
+        self.assertEqual(totals[self.recipe.id]['calories'], 300)
+        self.assertEqual(totals[self.recipe.id]['cost'], 60)
+        self.assertTrue(totals[self.recipe.id]['complete'])
+
+    def test_detail_nutrition(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['nutrition'], {
+            'calories': 300.0, 'proteins': 30.0, 'fats': 15.0,
+            'carbohydrates': 60.0, 'cost': 60.0, 'complete': True,
+        })
+
+    def test_etag_follows_ingredient_table(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Ingredient.objects.filter(pk=self.flour.pk).update(calories=150)
+        ingredient_table.table = None
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['nutrition']['calories'], 450)
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase
+from django.utils import timezone
+
+from api.filters import RecipeFilter
+from recipes.models import FavoriteRecipe, Recipe, RecipeScore
+from recipes.ranking import update_scores
+from recipes.tasks import update_recipe_scores
+from tasks.models import Task
+from tasks.queue import claim_tasks, execute_task, schedule_periodic_tasks
+from users.models import User
+
+
+class RankingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='reader', email='reader@example.com',
+            password='secret-pass'
+        )
+        cls.recipes = [
+            Recipe.objects.create(
+                author=cls.user, name=f'Рецепт {number}', text='Текст.',
+                image='recipes/images/recipe.png', cooking_time=10
+            )
+            for number in range(3)
+        ]
+
+    def ordered(self, ordering):
+        queryset = RecipeFilter({'ordering': ordering},
+                                Recipe.objects.all()).qs
+        self.assertNotIn('LEFT OUTER JOIN', str(queryset.query))
+        return list(queryset.values_list('id', flat=True))
+
+    def test_every_recipe_has_a_score(self):
+        self.assertEqual(RecipeScore.objects.count(), len(self.recipes))
+        update_scores(full=True)
+        self.assertEqual(RecipeScore.objects.count(), len(self.recipes))
+
+    def test_popular_ordering(self):
+        first, second, third = self.recipes
+        FavoriteRecipe.objects.create(user=self.user, recipe=first)
+        FavoriteRecipe.objects.filter(recipe=first).update(
+            added_at=timezone.now() - timedelta(hours=1)
+        )
+        update_scores(full=True)
+        self.assertEqual(self.ordered('popular'),
+                         [first.id, third.id, second.id])
+
+    def test_late_commit_is_counted(self):
+        update_scores(full=True)
+        recipe = self.recipes[0]
+        FavoriteRecipe.objects.create(user=self.user, recipe=recipe)
+        FavoriteRecipe.objects.filter(recipe=recipe).update(
+            added_at=timezone.now() - timedelta(seconds=10)
+        )
+        later = timezone.now() + timedelta(seconds=settings.RANKING_COMMIT_LAG)
+        with mock.patch('recipes.ranking.timezone.now', return_value=later):
+            _, full = update_scores()
+        self.assertFalse(full)
+        self.assertEqual(RecipeScore.objects.get(recipe=recipe).popular,
+                         settings.RANKING_FAVORITE_WEIGHT)
+
+
+class ScheduledRankingTests(TestCase):
+    def scheduled_tasks(self):
+        return list(Task.objects
+                    .filter(idempotency_key__startswith='schedule:')
+                    .order_by('id')
+                    .values_list('name', 'kwargs'))
+
+    def test_each_slot_is_scheduled_once(self):
+        now = datetime(2026, 1, 1, 12, tzinfo=dt_timezone.utc)
+        schedule_periodic_tasks({}, now)
+        schedule_periodic_tasks({}, now)
+        name = f'{update_recipe_scores.__module__}.update_recipe_scores'
+        self.assertEqual(self.scheduled_tasks(),
+                         [(name, {}), (name, {'full': True})])
+
+        later = now + timedelta(seconds=settings.RANKING_UPDATE_INTERVAL)
+        schedule_periodic_tasks({}, later)
+        self.assertEqual(self.scheduled_tasks()[2:], [(name, {})])
+
+    def test_scheduled_task_updates_scores(self):
+        user = User.objects.create_user(
+            username='reader', email='reader@example.com',
+            password='secret-pass'
+        )
+        recipe = Recipe.objects.create(
+            author=user, name='Рецепт', text='Текст.',
+            image='recipes/images/recipe.png', cooking_time=10
+        )
+        FavoriteRecipe.objects.create(user=user, recipe=recipe)
+        FavoriteRecipe.objects.update(
+            added_at=timezone.now() - timedelta(hours=1)
+        )
+        schedule_periodic_tasks({})
+        for task in claim_tasks(10):
+            if task[1].endswith('update_recipe_scores'):
+                self.assertIsNone(execute_task(*task)[2])
+        self.assertEqual(RecipeScore.objects.get(recipe=recipe).popular,
+                         settings.RANKING_FAVORITE_WEIGHT)
@@ -0,0 +1,116 @@
+import json
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from recipes.models import Ingredient, Recipe, Tag
+from recipes.transfer import RecipeImporter, export_recipes
+from users.models import User
+
+IMPORT_URL = '/api/recipes/import/'
+
+
+class RecipeTransferTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+        Tag.objects.create(name='Обед', slug='lunch', color='#49B64E')
+        Ingredient.objects.create(name='мука', measurement_unit='г')
+
+    def record(self, **fields):
+        record = {
+            'author': 'cook',
+            'name': 'Блины',
+            'text': 'Смешать и пожарить.',
+            'image': 'recipes/images/pancakes.png',
+            'cooking_time': 30,
+            'tags': ['lunch'],
+            'ingredients': [
+                {'name': 'мука', 'measurement_unit': 'г', 'amount': 200},
+            ],
+        }
+        record.update(fields)
+        return json.dumps(record, ensure_ascii=False)
+
+    def run_import(self, lines, batch_size=None):
+        importer = RecipeImporter(batch_size=batch_size)
+        return importer.run(lines)
+
+    def test_round_trip(self):
+        created, errors = self.run_import([self.record()])
+        self.assertEqual((created, errors), (1, []))
+
+        exported = json.loads(''.join(export_recipes()))
+        self.assertEqual(exported['tags'], ['lunch'])
+        self.assertEqual(exported['ingredients'], [
+            {'name': 'мука', 'measurement_unit': 'г', 'amount': 200.0},
+        ])
+
+    def test_reimport_skips_existing_recipes(self):
+        self.run_import([self.record(name='Первый')])
+        importer = RecipeImporter(batch_size=2)
+        created, errors = importer.run([
+            self.record(name='Второй'),
+            self.record(name='Второй'),
+            self.record(name='Первый'),
+            self.record(name='Второй'),
+        ])
+
+        self.assertEqual((created, errors, importer.skipped), (1, [], 3))
+        self.assertQuerysetEqual(
+            Recipe.objects.order_by('name').values_list('name', flat=True),
+            ['Второй', 'Первый']
+        )
+        exported = [json.loads(line)
+                    for line in ''.join(export_recipes()).splitlines()]
+        self.assertEqual([recipe['tags'] for recipe in exported],
+                         [['lunch'], ['lunch']])
+
+    def test_bad_lines_are_reported_and_skipped(self):
+        bad_ingredient = {'name': 'мука', 'measurement_unit': 'г'}
+        lines = [
+            self.record(name='Первый'),
+            '[1, 2]',
+            '"строка"',
+            '{не json',
+            self.record(ingredients=[dict(bad_ingredient, amount='abc')]),
+            self.record(ingredients=[dict(bad_ingredient, amount=0)]),
+            self.record(cooking_time='abc'),
+            self.record(cooking_time=0),
+            self.record(cooking_time=True),
+            self.record(name='x' * 201),
+            self.record(tags='lunch'),
+            self.record(tags=['unknown']),
+            self.record(author=['cook']),
+            self.record(name='Второй', tags=['lunch', 'lunch']),
+        ]
+        created, errors = self.run_import(lines, batch_size=len(lines))
+
+        self.assertEqual(created, 2)
+        self.assertEqual([number for number, _ in errors],
+                         list(range(2, len(lines))))
+        self.assertQuerysetEqual(
+            Recipe.objects.order_by('name').values_list('name', flat=True),
+            ['Второй', 'Первый']
+        )
+        self.assertEqual(
+            Recipe.objects.get(name='Второй').tags.count(), 1
+        )
+
+    def test_import_endpoint_reports_errors(self):
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='secret'
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        body = '\n'.join((self.record(), '[1, 2]')).encode()
+
+        response = client.generic('POST', IMPORT_URL, body,
+                                  content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual(response.json()['skipped'], 0)
+        self.assertEqual(response.json()['errors_count'], 1)
@@ -0,0 +1,58 @@
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from recipes.models import Ingredient, Recipe, RecipeIngredient, ShoppingCart
+from recipes.units import format_amount, normalized_totals, unit_grams
+from users.models import User
+
+
+class UnitGramsTests(SimpleTestCase):
+    def test_derived_from_conversions(self):
+        self.assertEqual(unit_grams('кг'), 1000)
+        self.assertEqual(unit_grams('мг'), 0.001)
+        self.assertEqual(unit_grams('л'), 1000)
+        self.assertIsNone(unit_grams('шт.'))
+
+
+class NormalizedTotalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='cook', email='cook@example.com', password='secret-pass'
+        )
+        for unit, amount in (('г', 317), ('кг', 0.3)):
+            recipe = Recipe.objects.create(
+                author=cls.user, name=f'Хлеб {unit}', text='Текст.',
+                image='recipes/images/recipe.png', cooking_time=10
+            )
+            ingredient = Ingredient.objects.create(name='мука',
+                                                   measurement_unit=unit)
+            RecipeIngredient.objects.create(recipe=recipe,
+                                            ingredient=ingredient,
+                                            amount=amount)
+            ShoppingCart.objects.create(user=cls.user, recipe=recipe)
+        milk = Ingredient.objects.create(name='молоко', measurement_unit='л')
+        RecipeIngredient.objects.create(recipe=recipe, ingredient=milk,
+                                        amount=0.5)
+
+    def test_single_grouped_query(self):
+        cart = RecipeIngredient.objects.filter(
+            recipe__users_cart__user=self.user
+        )
+        with self.assertNumQueries(1):
+            totals = list(normalized_totals(cart))
+        self.assertEqual(
+            [(row['name'], row['unit'],
+              format_amount(row['total_amount'], row['unit']))
+             for row in totals],
+            [('молоко', 'мл', '500'), ('мука', 'г', '617')]
+        )
+
+    def test_shopping_cart_download(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/recipes/download_shopping_cart/')
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        self.assertIn('мука - 617 г', text)
+        self.assertEqual(text.count('мука'), 1)
@@ -0,0 +1,270 @@
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from recipes.models import (Ingredient, Recipe, RecipeIngredient,
+                            RecipeScore, Tag)
+from recipes.tasks import fan_out_recipes
+from tasks.queue import enqueue
+from users.models import User
+
+RECIPE_EXPORT_FIELDS = ('id', 'author__username', 'name', 'text', 'image',
+                        'image_variants', 'cooking_time')
+
+UNKNOWN_AUTHOR = 'Неизвестный автор: {}'
+UNKNOWN_TAG = 'Неизвестный тег: {}'
+UNKNOWN_INGREDIENT = 'Неизвестный ингредиент: {} ({})'
+INVALID_LINE = 'Некорректная строка: {}'
+INVALID_RECORD = 'Запись должна быть объектом JSON'
+INVALID_FIELD = 'Некорректное значение поля {}: {}'
+RECIPE_NAME_MAX_LENGTH = Recipe._meta.get_field('name').max_length
+RECIPE_IMPORT_FIELDS = ('author', 'name', 'text', 'image', 'image_variants',
+                        'cooking_time', 'updated_at')
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def invalid_field(field, value):
+    return INVALID_FIELD.format(field, str(value)[:100])
+
+
+def export_recipes(queryset=None, chunk_size=None):
+    chunk_size = chunk_size or settings.RECIPE_TRANSFER_CHUNK_SIZE
+    queryset = Recipe.objects.all() if queryset is None else queryset
+    rows = (queryset
+            .order_by('id')
+            .values_list(*RECIPE_EXPORT_FIELDS)
+            .iterator(chunk_size=chunk_size))
+    for chunk in chunked(rows, chunk_size):
+        recipe_ids = [row[0] for row in chunk]
+        tags = defaultdict(list)
+        for recipe_id, slug in (Recipe.tags.through.objects
+                                .filter(recipe_id__in=recipe_ids)
+                                .values_list('recipe_id', 'tag__slug')):
+            tags[recipe_id].append(slug)
+        ingredients = defaultdict(list)
+        for recipe_id, name, unit, amount in (
+                RecipeIngredient.objects
+                .filter(recipe_id__in=recipe_ids)
+                .values_list('recipe_id', 'ingredient__name',
+                             'ingredient__measurement_unit', 'amount')):
+            ingredients[recipe_id].append({
+                'name': name,
+                'measurement_unit': unit,
+                'amount': amount,
+            })
+
+        yield ''.join(
+            json.dumps({
+                'id': recipe_id,
+                'author': author,
+                'name': name,
+                'text': text,
+                'image': image,
+                'image_variants': image_variants,
+                'cooking_time': cooking_time,
+                'tags': tags[recipe_id],
+                'ingredients': ingredients[recipe_id],
+            }, ensure_ascii=False) + '\n'
+            for (recipe_id, author, name, text, image, image_variants,
+                 cooking_time) in chunk
+        )
+
+
+def insert_rows(model, fields, rows, returning=None):
+    opts = model._meta
+    columns = [opts.get_field(field).column for field in fields]
+    batch_size = connection.ops.bulk_batch_size(columns, rows) or len(rows)
+    placeholder = '({})'.format(', '.join(['%s'] * len(columns)))
+    sql = 'INSERT INTO {} ({}) VALUES {{}} ON CONFLICT DO NOTHING'.format(
+        connection.ops.quote_name(opts.db_table),
+        ', '.join(connection.ops.quote_name(column) for column in columns),
+    )
+    if returning is not None:
+        sql += ' RETURNING {}'.format(
+            connection.ops.quote_name(opts.get_field(returning).column)
+        )
+    returned = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            cursor.execute(
+                sql.format(', '.join([placeholder] * len(batch))),
+                [value for row in batch for value in row]
+            )
+            if returning is not None:
+                returned.extend(row[0] for row in cursor.fetchall())
+    return returned
+
+
+class RecipeImporter:
+    def __init__(self, default_author=None, batch_size=None):
+        self.default_author = default_author
+        self.batch_size = batch_size or settings.RECIPE_TRANSFER_CHUNK_SIZE
+        self.tags = dict(Tag.objects.values_list('slug', 'id'))
+        self.ingredients = {}
+        for ingredient_id, name, unit in (Ingredient.objects
+                                          .order_by('-id')
+                                          .values_list('id', 'name',
+                                                       'measurement_unit')):
+            self.ingredients[name, unit] = ingredient_id
+        self.authors = {}
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+        self.variants_field = Recipe._meta.get_field('image_variants')
+
+    def run(self, lines):
+        numbered = enumerate(lines, start=1)
+        for batch in chunked(numbered, self.batch_size):
+            records = []
+            for number, line in batch:
+                if isinstance(line, bytes):
+                    line = line.decode(errors='replace')
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.errors.append((number, INVALID_LINE.format(
+                        line.strip()[:100])))
+                    continue
+                if not isinstance(record, dict):
+                    self.errors.append((number, INVALID_RECORD))
+                    continue
+                records.append((number, record))
+            self.import_batch(records)
+        return self.created, self.errors
+
+    def load_authors(self, records):
+        usernames = {record.get('author') for _, record in records
+                     if isinstance(record.get('author'), str)
+                     and record['author'] not in self.authors}
+        self.authors.update(User.objects
+                            .filter(username__in=usernames)
+                            .values_list('username', 'id'))
+
+    def validate(self, record):
+        name = record['name']
+        if (not isinstance(name, str) or not name
+                or len(name) > RECIPE_NAME_MAX_LENGTH):
+            return invalid_field('name', name)
+        for field in ('text', 'image'):
+            if not isinstance(record[field], str):
+                return invalid_field(field, record[field])
+        cooking_time = record['cooking_time']
+        if (not isinstance(cooking_time, int) or isinstance(cooking_time, bool)
+                or not settings.MIN_COOKING_TIME <= cooking_time
+                <= settings.MAX_COOKING_TIME):
+            return invalid_field('cooking_time', cooking_time)
+        for field in ('tags', 'ingredients'):
+            if not isinstance(record.get(field, []), list):
+                return invalid_field(field, record[field])
+        return None
+
+    def resolve(self, record):
+        error = self.validate(record)
+        if error:
+            return error
+
+        author_id = self.authors.get(record.get('author'))
+        if author_id is None and self.default_author is not None:
+            author_id = self.default_author.id
+        if author_id is None:
+            return UNKNOWN_AUTHOR.format(record.get('author'))
+
+        tag_ids = []
+        for slug in dict.fromkeys(record.get('tags', ())):
+            if slug not in self.tags:
+                return UNKNOWN_TAG.format(slug)
+            tag_ids.append(self.tags[slug])
+
+        ingredients = {}
+        for item in record.get('ingredients', ()):
+            key = item['name'], item['measurement_unit']
+            if key not in self.ingredients:
+                return UNKNOWN_INGREDIENT.format(*key)
+            amount = item['amount']
+            if (not is_number(amount)
+                    or not settings.MIN_AMOUNT <= amount
+                    <= settings.MAX_AMOUNT):
+                return invalid_field('amount', amount)
+            ingredients[self.ingredients[key]] = amount
+
+        recipe = (
+            author_id,
+            record['name'],
+            record['text'],
+            record['image'],
+            self.variants_field.get_db_prep_save(
+                record.get('image_variants', []), connection
+            ),
+            record['cooking_time'],
+        )
+        return recipe, tag_ids, ingredients
+
+    def skip_existing(self, resolved):
+        existing = set(Recipe.objects
+                       .filter(name__in={recipe[1]
+                                         for recipe, _, _ in resolved})
+                       .values_list('author_id', 'name'))
+        new = []
+        for result in resolved:
+            key = result[0][:2]
+            if key in existing:
+                self.skipped += 1
+            else:
+                existing.add(key)
+                new.append(result)
+        return new
+
+    @transaction.atomic
+    def import_batch(self, records):
+        self.load_authors(records)
+        resolved = []
+        for number, record in records:
+            try:
+                result = self.resolve(record)
+            except (KeyError, TypeError, ValueError) as error:
+                result = INVALID_LINE.format(error)
+            if isinstance(result, str):
+                self.errors.append((number, result))
+            else:
+                resolved.append(result)
+        resolved = self.skip_existing(resolved) if resolved else []
+        if not resolved:
+            return
+
+        updated_at = Recipe._meta.get_field('updated_at').get_db_prep_save(
+            timezone.now(), connection
+        )
+        recipe_ids = insert_rows(Recipe, RECIPE_IMPORT_FIELDS, [
+            (*recipe, updated_at) for recipe, _, _ in resolved
+        ], returning='id')
+        insert_rows(Recipe.tags.through, ('recipe', 'tag'), [
+            (recipe_id, tag_id)
+            for recipe_id, (_, tag_ids, _) in zip(recipe_ids, resolved)
+            for tag_id in tag_ids
+        ])
+        insert_rows(RecipeIngredient, ('recipe', 'ingredient', 'amount'), [
+            (recipe_id, ingredient_id, float(amount))
+            for recipe_id, (_, _, ingredients) in zip(recipe_ids, resolved)
+            for ingredient_id, amount in ingredients.items()
+        ])
+        insert_rows(RecipeScore, ('recipe', 'popular', 'trending'), [
+            (recipe_id, 0, 0) for recipe_id in recipe_ids
+        ])
+        enqueue(fan_out_recipes, recipe_ids=recipe_ids)
+        self.created += len(recipe_ids)
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db.models import Case, CharField, F, FloatField, Sum, Value, When
+
+
+def unit_grams(measurement_unit):
+    canonical, factor = settings.UNIT_CONVERSIONS.get(measurement_unit,
+                                                      (None, None))
+    if canonical == settings.MASS_UNIT:
+        return factor
+    density = settings.UNIT_DENSITIES.get(canonical)
+    return None if density is None else factor * density
+
+
+def canonical_unit(prefix='ingredient__'):
+    return Case(
+        When(**{f'{prefix}grams_per_unit__isnull': False},
+             then=Value(settings.MASS_UNIT)),
+        *(When(**{f'{prefix}measurement_unit': unit}, then=Value(canonical))
+          for unit, (canonical, _) in settings.UNIT_CONVERSIONS.items()),
+        default=F(f'{prefix}measurement_unit'),
+        output_field=CharField(),
+    )
+
+
+def unit_factor(prefix='ingredient__'):
+    return Case(
+        When(**{f'{prefix}grams_per_unit__isnull': False},
+             then=F(f'{prefix}grams_per_unit')),
+        *(When(**{f'{prefix}measurement_unit': unit}, then=Value(factor))
+          for unit, (_, factor) in settings.UNIT_CONVERSIONS.items()),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+
+
+def normalized_totals(recipe_ingredients):
+    return (recipe_ingredients
+            .values(name=F('ingredient__name'), unit=canonical_unit())
+            .annotate(total_amount=Sum(F('amount') * unit_factor(),
+                                       output_field=FloatField()))
+            .order_by('name', 'unit'))
+
+
+def format_amount(amount, unit):
+    precision = settings.UNIT_PRECISION.get(unit,
+                                            settings.DEFAULT_UNIT_PRECISION)
+    text = f'{amount:.{precision}f}'
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    return text
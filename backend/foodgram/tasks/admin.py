@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from foodgram.pagination import EstimatedCountPaginator
+from tasks.models import Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'duration',
+                    'created_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'idempotency_key')
+    readonly_fields = ('created_at', 'started_at', 'finished_at',
+                       'duration', 'last_error')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+admin.site.register(Task, TaskAdmin)
@@ -0,0 +1,79 @@
+import multiprocessing
+import signal
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.queue import (claim_tasks, execute_task, finish_task,
+                         schedule_periodic_tasks)
+
+
+class Command(BaseCommand):
+    help = ('Выполняет фоновые задачи из очереди в пуле процессов. '
+            'Останавливается по SIGTERM/SIGINT после завершения '
+            'текущих задач.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int,
+                            default=settings.TASKS_WORKERS)
+        parser.add_argument('--poll-interval', type=float,
+                            default=settings.TASKS_POLL_INTERVAL)
+        parser.add_argument('--once', action='store_true',
+                            help='Выполнить готовые задачи и завершиться.')
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.stop)
+
+        workers = options['workers']
+        self.stats = defaultdict(Counter)
+        running = set()
+        scheduled = {}
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup) as executor:
+            while not self.stopping.is_set() or running:
+                free = workers - len(running)
+                if not self.stopping.is_set():
+                    schedule_periodic_tasks(scheduled)
+                if free and not self.stopping.is_set():
+                    for task in claim_tasks(free):
+                        running.add(executor.submit(execute_task, *task))
+                if not running:
+                    if options['once']:
+                        break
+                    self.stopping.wait(options['poll_interval'])
+                    continue
+                done, running = wait(running,
+                                     timeout=options['poll_interval'],
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.record(*future.result())
+
+        self.report()
+
+    def stop(self, signum, frame):
+        self.stopping.set()
+
+    def record(self, task_id, duration, error):
+        task = finish_task(task_id, duration, error)
+        stats = self.stats[task.name]
+        stats['total'] += 1
+        stats['failed'] += error is not None
+        stats['seconds'] += duration
+        stats['max_ms'] = max(stats['max_ms'], round(duration * 1000))
+
+    def report(self):
+        for name, stats in sorted(self.stats.items()):
+            average = stats['seconds'] / stats['total'] * 1000
+            self.stdout.write(
+                f'{name}: выполнено {stats["total"]}, '
+                f'ошибок {stats["failed"]}, '
+                f'среднее {average:.1f} мс, максимум {stats["max_ms"]} мс'
+            )
@@ -0,0 +1,64 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=255, verbose_name='Функция')
+    kwargs = models.JSONField(default=dict, verbose_name='Аргументы')
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name='Ключ идемпотентности'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Максимум попыток'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Выполнить не раньше'
+    )
+    created_at = models.DateTimeField(auto_now_add=True,
+                                      verbose_name='Дата создания')
+    started_at = models.DateTimeField(null=True, blank=True,
+                                      verbose_name='Начало выполнения')
+    finished_at = models.DateTimeField(null=True, blank=True,
+                                       verbose_name='Окончание выполнения')
+    duration = models.FloatField(null=True, blank=True,
+                                 verbose_name='Длительность, с')
+    last_error = models.TextField(blank=True,
+                                  verbose_name='Последняя ошибка')
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+    class Meta:
+        ordering = ('-id',)
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = (
+            models.Index(fields=('status', 'run_after'),
+                         name='task_status_run_after_idx'),
+        )
@@ -0,0 +1,96 @@
+import json
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from tasks.models import Task
+
+logger = logging.getLogger('foodgram.tasks')
+
+
+def enqueue(func, idempotency_key=None, **kwargs):
+    Task.objects.bulk_create((Task(
+        name=f'{func.__module__}.{func.__qualname__}',
+        kwargs=kwargs,
+        idempotency_key=idempotency_key,
+        max_attempts=settings.TASKS_MAX_ATTEMPTS,
+    ),), ignore_conflicts=True)
+
+
+def schedule_periodic_tasks(scheduled, now=None):
+    now = now or timezone.now()
+    for name, (path, interval, kwargs) in settings.TASKS_SCHEDULE.items():
+        slot = int(now.timestamp() // interval)
+        if scheduled.get(name) != slot:
+            enqueue(import_string(path),
+                    idempotency_key=f'schedule:{name}:{slot}', **kwargs)
+            scheduled[name] = slot
+
+
+def claim_tasks(limit):
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASKS_VISIBILITY_TIMEOUT)
+    with transaction.atomic():
+        tasks = list(
+            Task.objects
+            .filter(Q(status=Task.PENDING, run_after__lte=now)
+                    | Q(status=Task.RUNNING, started_at__lt=stale))
+            .order_by('run_after', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', 'name', 'kwargs')[:limit]
+        )
+        Task.objects.filter(id__in=[task[0] for task in tasks]).update(
+            status=Task.RUNNING,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+    return tasks
+
+
+def execute_task(task_id, name, kwargs):
+    start = time.perf_counter()
+    try:
+        import_string(name)(**kwargs)
+    except Exception:
+        return task_id, time.perf_counter() - start, traceback.format_exc()
+    return task_id, time.perf_counter() - start, None
+
+
+def finish_task(task_id, duration, error):
+    task = Task.objects.only('name', 'attempts', 'max_attempts').get(
+        pk=task_id
+    )
+    now = timezone.now()
+    task.finished_at = now
+    task.duration = duration
+    if error is None:
+        task.status = Task.DONE
+        task.last_error = ''
+    elif task.attempts < task.max_attempts:
+        task.status = Task.PENDING
+        task.last_error = error
+        task.run_after = now + timedelta(
+            seconds=settings.TASKS_RETRY_DELAY * 2 ** (task.attempts - 1)
+        )
+    else:
+        task.status = Task.FAILED
+        task.last_error = error
+    task.save(update_fields=('status', 'finished_at', 'duration',
+                             'last_error', 'run_after'))
+
+    logger.log(logging.INFO if error is None else logging.WARNING,
+               json.dumps({
+                   'task': task.name,
+                   'id': task_id,
+                   'status': task.status,
+                   'attempt': task.attempts,
+                   'duration_ms': round(duration * 1000, 2),
+               }))
+    return task
@@ -2,13 +2,16 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
 
+from foodgram.pagination import EstimatedCountPaginator
 from users.models import User, Subscription
 
 
 class MyUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff')
-    list_filter = ('email', 'username')
+    list_filter = ('is_staff', 'is_active')
     search_fields = ('email', 'first_name', 'last_name', 'username')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     fieldsets = (
         (None, {'fields': ('username', 'email', 'password')}),
         (_('Personal info'), {'fields': ('first_name', 'last_name')}),
@@ -29,8 +32,11 @@ class MyUserAdmin(UserAdmin):
 
 class SubscriptionAdmin(admin.ModelAdmin):
     list_display = ('user', 'author')
-    list_filter = ('user', 'author')
+    list_select_related = ('user', 'author')
     search_fields = ('user__username', 'author__username')
+    autocomplete_fields = ('user', 'author')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(User, MyUserAdmin)
@@ -0,0 +1,38 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, check_password
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    thread_name_prefix='password-hashing'
+                )
+    return _executor
+
+
+def run_hashing(func, *args):
+    return get_executor().submit(func, *args).result()
+
+
+def verify_password(raw_password, encoded):
+    must_update = []
+    is_correct = check_password(
+        raw_password, encoded, lambda password: must_update.append(True)
+    )
+    return is_correct, bool(must_update)
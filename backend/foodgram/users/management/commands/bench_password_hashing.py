@@ -0,0 +1,46 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+
+from users.hashers import verify_password
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+
+class Command(BaseCommand):
+    help = ('Измеряет число проверок пароля в секунду для текущих '
+            'PASSWORD_HASHERS: на одно ядро и при параллельной нагрузке.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=50)
+        parser.add_argument('--threads', type=int,
+                            default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        logins = options['logins']
+        threads = options['threads']
+        encoded = make_password(BENCHMARK_PASSWORD)
+
+        start = time.perf_counter()
+        for _ in range(logins):
+            verify_password(BENCHMARK_PASSWORD, encoded)
+        single = logins / (time.perf_counter() - start)
+
+        total = logins * threads
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(verify_password,
+                              repeat(BENCHMARK_PASSWORD, total),
+                              repeat(encoded, total)))
+        parallel = total / (time.perf_counter() - start)
+
+        self.stdout.write(f'Алгоритм: {encoded.split("$", 1)[0]}')
+        self.stdout.write(f'Входов в секунду (1 поток): {single:.1f}')
+        self.stdout.write(
+            f'Входов в секунду ({threads} потоков): {parallel:.1f}, '
+            f'на ядро: {parallel / threads:.1f}'
+        )
@@ -0,0 +1,62 @@
+import time
+
+from django.db import transaction
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from rest_framework.exceptions import ValidationError
+
+from api.serializers import UsersSerializer
+
+FAST_HASHERS = ('django.contrib.auth.hashers.MD5PasswordHasher',)
+
+
+class Command(BaseCommand):
+    help = ('Измеряет пропускную способность регистрации пользователей '
+            'через UsersSerializer. Созданные записи откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument(
+            '--real-hasher',
+            action='store_true',
+            help='Использовать настроенный хешер паролей вместо MD5.'
+        )
+
+    def handle(self, *args, **options):
+        total = options['users']
+        hashers = {} if options['real_hasher'] else {
+            'PASSWORD_HASHERS': FAST_HASHERS
+        }
+
+        with override_settings(**hashers), transaction.atomic():
+            start = time.perf_counter()
+            for number in range(total):
+                serializer = UsersSerializer(data={
+                    'email': f'bench-{number}@example.com',
+                    'username': f'bench-{number}',
+                    'first_name': 'Bench',
+                    'last_name': 'User',
+                    'password': 'bench-password',
+                })
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+            elapsed = time.perf_counter() - start
+
+            duplicate = UsersSerializer(data={
+                'email': 'BENCH-0@example.com',
+                'username': 'bench-duplicate',
+                'first_name': 'Bench',
+                'last_name': 'User',
+                'password': 'bench-password',
+            })
+            duplicate.is_valid(raise_exception=True)
+            try:
+                duplicate.save()
+            except ValidationError as error:
+                self.stdout.write(f'Дубликат отклонён: {error}')
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f'Регистраций: {total}, за {elapsed:.2f} с, '
+            f'{total / elapsed:.1f} в секунду'
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.4 on 2026-10-19 09:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_followers_count(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Subscription = apps.get_model('users', 'Subscription')
+    followers = (Subscription.objects
+                 .filter(author=OuterRef('pk'))
+                 .values('author')
+                 .annotate(total=Count('pk'))
+                 .values('total'))
+    User.objects.update(followers_count=Coalesce(Subquery(followers), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_alter_subscription_options_alter_user_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество подписчиков'),
+        ),
+        migrations.RunPython(fill_followers_count, migrations.RunPython.noop),
+    ]
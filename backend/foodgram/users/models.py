@@ -1,16 +1,43 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 
+from users.hashers import run_hashing, verify_password
+
 
 class User(AbstractUser):
     email = models.EmailField(unique=True)
+    followers_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество подписчиков'
+    )
 
     def __str__(self):
         return self.username
 
+    def set_password(self, raw_password):
+        run_hashing(super().set_password, raw_password)
+
+    def check_password(self, raw_password):
+        is_correct, must_update = run_hashing(
+            verify_password, raw_password, self.password
+        )
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=('password',))
+        return is_correct
+
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        constraints = (
+            models.UniqueConstraint(Lower('email'),
+                                    name='uniq_user_email_ci'),
+            models.UniqueConstraint(Lower('username'),
+                                    name='uniq_user_username_ci'),
+        )
 
 
 class Subscription(models.Model):
@@ -0,0 +1,50 @@
+import argparse
+import threading
+import time
+
+from loadtest.scenario import run_endpoint, run_user
+from loadtest.stats import Stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Нагрузочный сценарий для API Foodgram.'
+    )
+    parser.add_argument('--host', default='http://localhost:8000')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=60,
+                        help='Длительность теста в секундах.')
+    parser.add_argument('--ramp-up', type=float, default=5,
+                        help='Время запуска всех пользователей в секундах.')
+    parser.add_argument('--think-time', type=float, default=1,
+                        help='Максимальная пауза между шагами в секундах.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--path',
+                        help='Нагружать только один GET-эндпоинт '
+                             'без пауз, например /api/recipes/.')
+    args = parser.parse_args()
+
+    stats = Stats()
+    deadline = time.monotonic() + args.duration
+    threads = []
+    for number in range(args.users):
+        if args.path:
+            target = run_endpoint
+            target_args = (args.host, stats, args.path, deadline)
+        else:
+            target = run_user
+            target_args = (args.host, stats, args.seed + number, deadline,
+                           args.think_time)
+        thread = threading.Thread(target=target, args=target_args,
+                                  daemon=True)
+        thread.start()
+        threads.append(thread)
+        time.sleep(args.ramp_up / max(args.users, 1))
+
+    for thread in threads:
+        thread.join()
+    print(stats.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+import base64
+import random
+import time
+import uuid
+
+import requests
+
+PNG_PIXEL = base64.b64encode(bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010802000000907753de'
+    '0000000c4944415478da6378f6ec1900056802b33c3817670000000049454e44ae'
+    '426082'
+)).decode()
+INGREDIENT_PREFIXES = ('а', 'бе', 'ка', 'мо', 'са', 'то')
+PASSWORD = 'Load-test-password-1'
+
+
+class VirtualUser:
+    def __init__(self, host, stats, rng, think_time):
+        self.host = host.rstrip('/')
+        self.stats = stats
+        self.rng = rng
+        self.think_time = think_time
+        self.session = requests.Session()
+        self.tags = []
+
+    def request(self, method, path, name=None, expected=(200,), **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.host + path,
+                                            **kwargs)
+        except requests.RequestException:
+            self.stats.record(name or path, time.perf_counter() - start,
+                              False)
+            return None
+        self.stats.record(name or path, time.perf_counter() - start,
+                          response.status_code in expected)
+        return response
+
+    def think(self):
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, self.think_time))
+
+    def sign_up(self):
+        suffix = uuid.uuid4().hex[:12]
+        email = f'load-{suffix}@example.com'
+        self.request('POST', '/api/users/', expected=(201,), json={
+            'email': email,
+            'username': f'load-{suffix}',
+            'first_name': 'Нагрузка',
+            'last_name': 'Тест',
+            'password': PASSWORD,
+        })
+        response = self.request('POST', '/api/auth/token/login/',
+                                json={'email': email, 'password': PASSWORD})
+        if response is not None and response.ok:
+            token = response.json()['auth_token']
+            self.session.headers['Authorization'] = f'Token {token}'
+
+    def browse(self):
+        response = self.request('GET', '/api/tags/')
+        if response is not None and response.ok:
+            self.tags = response.json()
+
+        params = {'page': self.rng.randint(1, 5), 'limit': 6}
+        if self.tags:
+            params['tags'] = [
+                tag['slug'] for tag in self.rng.sample(
+                    self.tags, self.rng.randint(1, len(self.tags)))
+            ]
+        response = self.request('GET', '/api/recipes/', params=params,
+                                name='/api/recipes/?tags=')
+        if response is None or not response.ok:
+            return []
+        return [recipe['id'] for recipe in response.json()['results']]
+
+    def open_recipe(self, recipe_id):
+        self.request('GET', f'/api/recipes/{recipe_id}/',
+                     name='/api/recipes/{id}/')
+
+    def toggle(self, recipe_id, action):
+        name = f'/api/recipes/{{id}}/{action}/'
+        path = f'/api/recipes/{recipe_id}/{action}/'
+        self.request('POST', path, name=name, expected=(201, 400))
+        if self.rng.random() < 0.5:
+            self.request('DELETE', path, name=name, expected=(204, 400))
+
+    def search_ingredients(self):
+        response = self.request(
+            'GET', '/api/ingredients/', name='/api/ingredients/?name=',
+            params={'name': self.rng.choice(INGREDIENT_PREFIXES)}
+        )
+        if response is None or not response.ok:
+            return []
+        return [ingredient['id'] for ingredient in response.json()]
+
+    def create_recipe(self, ingredient_ids):
+        if not ingredient_ids or not self.tags:
+            return
+        ingredients = self.rng.sample(
+            ingredient_ids, min(len(ingredient_ids), self.rng.randint(2, 8)))
+        self.request('POST', '/api/recipes/', expected=(201,), json={
+            'name': 'Рецепт нагрузочного теста',
+            'text': 'Создан сценарием нагрузочного тестирования.',
+            'cooking_time': self.rng.randint(5, 120),
+            'image': f'data:image/png;base64,{PNG_PIXEL}',
+            'tags': [tag['id'] for tag in self.tags[:2]],
+            'ingredients': [
+                {'id': ingredient_id, 'amount': self.rng.randint(1, 500)}
+                for ingredient_id in ingredients
+            ],
+        })
+
+    def download_shopping_cart(self):
+        self.request('GET', '/api/recipes/download_shopping_cart/')
+
+    def journey(self):
+        recipe_ids = self.browse()
+        self.think()
+        for recipe_id in self.rng.sample(recipe_ids,
+                                         min(len(recipe_ids), 3)):
+            self.open_recipe(recipe_id)
+            self.think()
+            self.toggle(recipe_id, 'favorite')
+            self.toggle(recipe_id, 'shopping_cart')
+        ingredient_ids = self.search_ingredients()
+        self.think()
+        if self.rng.random() < 0.1:
+            self.create_recipe(ingredient_ids)
+        self.download_shopping_cart()
+        self.think()
+
+
+def run_user(host, stats, seed, deadline, think_time):
+    user = VirtualUser(host, stats, random.Random(seed), think_time)
+    user.sign_up()
+    while time.monotonic() < deadline:
+        user.journey()
+
+
+def run_endpoint(host, stats, path, deadline):
+    user = VirtualUser(host, stats, random.Random(), think_time=0)
+    while time.monotonic() < deadline:
+        user.request('GET', path)
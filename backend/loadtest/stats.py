@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import defaultdict
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    index = min(int(len(values) * fraction), len(values) - 1)
+    return values[index]
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.started = time.perf_counter()
+
+    def record(self, name, seconds, ok):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        header = (f'{"Запрос":<40} {"всего":>7} {"rps":>7} {"ошибки":>7} '
+                  f'{"p50 мс":>8} {"p90 мс":>8} {"p99 мс":>8}')
+        lines = [header, '-' * len(header)]
+        total = errors = 0
+        with self.lock:
+            for name in sorted(self.latencies):
+                values = sorted(self.latencies[name])
+                total += len(values)
+                errors += self.errors[name]
+                lines.append(
+                    f'{name:<40} {len(values):>7} '
+                    f'{len(values) / elapsed:>7.1f} '
+                    f'{self.errors[name] / len(values):>7.1%} '
+                    f'{percentile(values, 0.5) * 1000:>8.1f} '
+                    f'{percentile(values, 0.9) * 1000:>8.1f} '
+                    f'{percentile(values, 0.99) * 1000:>8.1f}'
+                )
+        lines.append('-' * len(header))
+        lines.append(f'Итого: {total} запросов за {elapsed:.1f} с, '
+                     f'{total / elapsed:.1f} rps, ошибок: {errors}')
+        return '\n'.join(lines)
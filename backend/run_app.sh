@@ -1,8 +1,4 @@
 #!/bin/sh
 cd foodgram || exit
-python3 manage.py makemigrations;
-python3 manage.py migrate;
-python3 manage.py collectstatic --noinput;
-python3 manage.py loaddata dump.json;
-cp -r /app/foodgram/collected_static/. /app/static/;
-gunicorn -b 0:8000 foodgram.wsgi;
\ No newline at end of file
+python3 manage.py startup || exit;
+exec gunicorn -c gunicorn.conf.py foodgram.wsgi;